@@ -0,0 +1,21 @@
+"""
+Simulation of a school of fish hunted by sharks and seagulls.
+
+Only the simulation core is imported here. The web interface lives in
+`fishnsharks.server` and is imported on first access.
+"""
+
+import importlib
+
+from fishnsharks.model import OCEAN_HEIGHT, OCEAN_WIDTH, Ocean
+
+_LAZY_ATTRIBUTES = {
+    "ContinuousCanvas": "fishnsharks.server",
+    "build_server": "fishnsharks.server",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,3 @@
+from fishnsharks.server import main
+
+main()
@@ -1,3 +1,4 @@
-from agents.fish import Fish
-from agents.shark import Shark
-from agents.seagull import Seagull
\ No newline at end of file
+from fishnsharks.agents.base import Agent
+from fishnsharks.agents.fish import Fish
+from fishnsharks.agents.shark import Shark
+from fishnsharks.agents.seagull import Seagull
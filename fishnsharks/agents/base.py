@@ -0,0 +1,37 @@
+from random import Random
+
+import mesa
+
+
+class Agent:
+    """
+    Slotted replacement of mesa.Agent.
+
+    mesa.Agent declares no __slots__, so every instance of its subclasses carries a __dict__
+    whatever they declare. This class provides the same interface, the only one the mesa
+    schedulers rely on, without it.
+    """
+
+    __slots__ = ("unique_id", "model", "pos")
+
+    def __init__(self, unique_id: int, model: mesa.Model):
+        """
+        Standard constructor for the Agent class.
+
+        Args:
+            unique_id (int): The unique id of the agent.
+            model (mesa.Model): The model containing the agent.
+        """
+        self.unique_id = unique_id
+        self.model = model
+        self.pos = None
+
+    def step(self):
+        """A single step of the agent."""
+
+    def advance(self):
+        """Second phase of a step, for the schedulers activating agents in two phases."""
+
+    @property
+    def random(self) -> Random:
+        return self.model.random
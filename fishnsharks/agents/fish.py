@@ -1,16 +1,31 @@
+from typing import Optional
+
 import mesa
 import numpy as np
 
-from utils import direction_to, move, is_outside, is_on_obstacle
+from fishnsharks.agents.base import Agent
+from fishnsharks.utils import direction_to, move, is_outside, is_on_obstacle
 
 
-class Fish(mesa.Agent):
+class Fish(Agent):
     """
     Agent representing a fish which evolves in a swarm.
 
 
     """
 
+    __slots__ = (
+        "max_speed",
+        "speed",
+        "vision",
+        "following_rate",
+        "alarmed_rate",
+        "angle",
+        "max_memory",
+        "memory",
+        "panicked_by",
+    )
+
     def __init__(
         self,
         ocean: mesa.Model,
@@ -70,20 +85,24 @@ class Fish(mesa.Agent):
         return portrayal
 
     def step(self, recursion_depth: int = 0, verbose: bool = False):
-        if recursion_depth == 0:
-            self.speed = self.max_speed
-        if recursion_depth > 500:
-            self.speed = 0
-            return
+        self.act(self.sense(), recursion_depth, verbose)
+
+    def sense(self) -> Optional[str]:
+        """
+        Look for predators around the fish.
 
+        Returns:
+            Optional[str]: "SG" if a seagull is in sight, else "SK" if a shark is in sight,
+                else None.
+        """
+        threat = None
         for shark in self.model.list_sharks:
             dist = np.sqrt(
                 (self.pos[0] - shark.pos[0]) ** 2 + (self.pos[1] - shark.pos[1]) ** 2
             )
 
-            if dist <= self.vision:
-                self.memory = self.max_memory
-                self.panicked_by = "SK"
+            if dist <= self.vision and self.model.can_see(self.pos, shark.pos):
+                threat = "SK"
 
         for seagull in self.model.list_seagulls:
             dist = np.sqrt(
@@ -91,9 +110,32 @@ class Fish(mesa.Agent):
                 + (self.pos[1] - seagull.pos[1]) ** 2
             )
 
-            if dist <= self.vision:
-                self.memory = self.max_memory
-                self.panicked_by = "SG"
+            if dist <= self.vision and self.model.can_see(self.pos, seagull.pos):
+                threat = "SG"
+        return threat
+
+    def act(
+        self, threat: Optional[str], recursion_depth: int = 0, verbose: bool = False
+    ):
+        """
+        Move the fish given what it perceived.
+
+        Args:
+            threat (Optional[str]): The predator in sight, as returned by sense.
+            recursion_depth (int, optional): The number of forbidden positions reached
+                during this step. Defaults to 0.
+            verbose (bool, optional): Whether to print the speed of the fish. Defaults to
+                False.
+        """
+        if recursion_depth == 0:
+            self.speed = self.max_speed
+        if recursion_depth > 500:
+            self.speed = 0
+            return
+
+        if threat is not None:
+            self.memory = self.max_memory
+            self.panicked_by = threat
 
         # Choose new direction
         new_angle = np.random.random() * np.pi * 2
@@ -148,7 +190,7 @@ class Fish(mesa.Agent):
             new_pos, self.model, d_safe=1
         ):
             self.speed /= 2  # If a forbidden position is reached, slow down and try another direction
-            self.step(recursion_depth + 1)
+            self.act(threat, recursion_depth + 1)
         self.pos = new_pos
 
         if verbose:
@@ -1,18 +1,34 @@
+from typing import List
+
 import mesa
 import numpy as np
-from env import Blood
-from utils import direction_to, distanceL2, go_to, move
+from fishnsharks.agents.base import Agent
+from fishnsharks.events import SEAGULL_KILL
+from fishnsharks.utils import direction_to, distanceL2, go_to, move
 
 OCEAN_HEIGHT = 600
 
 
-class Seagull(mesa.Agent):
+class Seagull(Agent):
     """
     Agent representing a seagull.
 
 
     """
 
+    __slots__ = (
+        "max_speed",
+        "speed",
+        "angle",
+        "vision",
+        "distance_eat",
+        "rest_time",
+        "fishing",
+        "flying_away",
+        "rest_countdown",
+        "target_pos",
+    )
+
     def __init__(
         self,
         ocean: mesa.Model,
@@ -57,8 +73,34 @@ class Seagull(mesa.Agent):
         return portrayal
 
     def step(self, verbose: bool = True):
+        self.act(verbose=verbose)
+
+    def sense(self) -> List[Agent]:
+        """
+        Look for fish around the seagull.
+
+        Returns:
+            List[Agent]: The fish in sight. Only the first one is targeted.
+        """
         visible_fish = []
+        for fish in self.model.list_fish:
+            dist_to_fish = np.sqrt(
+                (self.pos[0] - fish.pos[0]) ** 2 + (self.pos[1] - fish.pos[1]) ** 2
+            )
+            if dist_to_fish < self.vision and self.model.can_see(self.pos, fish.pos):
+                visible_fish.append(fish)
+        return visible_fish
 
+    def act(self, visible_fish: List[Agent] = None, verbose: bool = True):
+        """
+        Move the seagull and catch fish.
+
+        Args:
+            visible_fish (List[Agent], optional): The fish in sight, as returned by
+                sense. Defaults to None, the seagull looks for fish when it needs to.
+            verbose (bool, optional): Whether to print what the seagull does. Defaults to
+                True.
+        """
         if self.rest_countdown:
             self.rest_countdown -= 1
 
@@ -73,10 +115,10 @@ class Seagull(mesa.Agent):
                         (self.pos[0] - fish.pos[0]) ** 2
                         + (self.pos[1] - fish.pos[1]) ** 2
                     )
-                    if dist_to_fish < self.distance_eat:
+                    if dist_to_fish < self.distance_eat and self.model.kill(
+                        fish, 40 * 2, SEAGULL_KILL, self
+                    ):
                         self.fishing = False
-                        self.model.bloods.append(Blood(*fish.pos, 1, 40 * 2, 40))
-                        self.model.schedule.remove(fish)
                         break
 
                 # go away
@@ -99,13 +141,8 @@ class Seagull(mesa.Agent):
 
         # Look for fish to eat
         if not self.rest_countdown and not self.fishing and not self.flying_away:
-            visible_fish = []
-            for fish in self.model.list_fish:
-                dist_to_fish = np.sqrt(
-                    (self.pos[0] - fish.pos[0]) ** 2 + (self.pos[1] - fish.pos[1]) ** 2
-                )
-                if dist_to_fish < self.vision:
-                    visible_fish.append(fish)
+            if visible_fish is None:
+                visible_fish = self.sense()
 
             found = False
             for fish in visible_fish:
@@ -132,3 +169,9 @@ class Seagull(mesa.Agent):
                 self.model,
             )
         pass
+
+    def kill_denied(self):
+        """
+        Called when another predator caught the fish claimed by the seagull during a staged
+        step. The seagull flies away anyway.
+        """
@@ -1,11 +1,14 @@
+from typing import List, Optional, Tuple
+
 import mesa
 import numpy as np
 
-from env.blood import Blood
-from utils import move, go_to
+from fishnsharks.agents.base import Agent
+from fishnsharks.events import SHARK_KILL, STRANDING
+from fishnsharks.utils import move, go_to
 
 
-class Shark(mesa.Agent):
+class Shark(Agent):
     """
     Agent representing a shark seeking to eat fish
 
@@ -17,9 +20,24 @@ class Shark(mesa.Agent):
         - max_speed (int): Maximum travel distance per step. (default=10)
     """
 
+    __slots__ = (
+        "speed",
+        "max_speed",
+        "angle",
+        "vision",
+        "distance_eat",
+        "inSand",
+        "proba_change_angle",
+        "rest_time",
+        "remaining_rest_time",
+        "blood_thresh",
+        "slowing_factor",
+        "stranded_proba",
+    )
+
     def __init__(
         self,
-        ocean: mesa.Agent,
+        ocean: mesa.Model,
         x: float,
         y: float,
         unique_id: int,
@@ -35,7 +53,7 @@ class Shark(mesa.Agent):
         Agent representing a shark seeking to eat fish.
 
         Args:
-            ocean (mesa.Agent): The environment in which the fish evolves.
+            ocean (mesa.Model): The environment in which the fish evolves.
             x (float): The initial x position of the fish.
             y (float): The initial y position of the fish.
             unique_id (int): A unique number to identify the agent.
@@ -82,22 +100,71 @@ class Shark(mesa.Agent):
         return portrayal
 
     def step(self, verbose: bool = False) -> None:
-        # slows down in the sand
-        countSands = 0
+        self.act(*self.sense(), verbose=verbose)
+
+    def sense(self) -> Tuple[int, Optional[Agent], float, List[float]]:
+        """
+        Look at the sand, the fish and the bloods around the shark.
+
+        Returns:
+            Tuple[int, Optional[Agent], float, List[float]]: The number of sands the
+                shark is in, the nearest fish in sight (None if there is none) and its
+                distance (infinite if there is none), and the distance to each blood.
+        """
+        n_sands = 0
         for sand in self.model.sands:
             dist = np.sqrt(
                 (self.pos[0] - sand.pos[0]) ** 2 + (self.pos[1] - sand.pos[1]) ** 2
             )
             if dist <= sand.r:
-                if self.inSand == False:
-                    self.speed = self.slowing_factor * self.max_speed / 2
-                    self.inSand = True
-                    countSands += 1
-                # wash ashore
-                if np.random.random() < self.stranded_proba:
-                    self.model.bloods.append(Blood(*self.pos, 1, self.vision * 2, 40))
-                    self.model.schedule.remove(self)
-                    return
+                n_sands += 1
+
+        nearest_fish = None
+        d_nearest_fish = np.inf
+        for fish in self.model.list_fish:
+            dist = np.sqrt(
+                (self.pos[0] - fish.pos[0]) ** 2 + (self.pos[1] - fish.pos[1]) ** 2
+            )
+            if dist < d_nearest_fish and self.model.can_see(self.pos, fish.pos):
+                nearest_fish = fish
+                d_nearest_fish = dist
+
+        blood_distances = [
+            np.sqrt((self.pos[0] - blood.x) ** 2 + (self.pos[1] - blood.y) ** 2)
+            for blood in self.model.bloods
+        ]
+        return n_sands, nearest_fish, d_nearest_fish, blood_distances
+
+    def act(
+        self,
+        n_sands: int,
+        nearest_fish: Optional[Agent],
+        d_nearest_fish: float,
+        blood_distances: List[float],
+        verbose: bool = False,
+    ) -> None:
+        """
+        Move the shark and eat fish given what it perceived.
+
+        Args:
+            n_sands (int): The number of sands the shark is in.
+            nearest_fish (Optional[Agent]): The nearest fish in sight.
+            d_nearest_fish (float): The distance to the nearest fish.
+            blood_distances (List[float]): The distance to each blood of the ocean when the
+                shark looked at them. Bloods added since then are ignored.
+            verbose (bool, optional): Whether to print what the shark does. Defaults to False.
+        """
+        # slows down in the sand
+        countSands = 0
+        for _ in range(n_sands):
+            if self.inSand == False:
+                self.speed = self.slowing_factor * self.max_speed / 2
+                self.inSand = True
+                countSands += 1
+            # wash ashore
+            if np.random.random() < self.stranded_proba:
+                self.model.kill(self, self.vision * 2, STRANDING)
+                return
         # gets out of the sand
         if countSands == 0 and self.inSand:
             self.speed = self.max_speed / 2
@@ -107,26 +174,11 @@ class Shark(mesa.Agent):
             self.remaining_rest_time -= 1
         self.blood_thresh -= 1
 
-        i_nearest_fish = -1
-        d_nearest_fish = None
-        for i_fish, fish in enumerate(self.model.list_fish):
-            dist = np.sqrt(
-                (self.pos[0] - fish.pos[0]) ** 2 + (self.pos[1] - fish.pos[1]) ** 2
-            )
-            if d_nearest_fish is None:
-                i_nearest_fish = i_fish
-                d_nearest_fish = dist
-            elif dist < d_nearest_fish:
-                i_nearest_fish = i_fish
-                d_nearest_fish = dist
-
-        nearest_fish = self.model.list_fish[i_nearest_fish]
         if d_nearest_fish <= self.distance_eat and not self.rest:
-            if verbose:
-                print("FISH EATEN")
-            self.model.bloods.append(Blood(*nearest_fish.pos, 1, self.vision * 2, 40))
-            self.model.schedule.remove(nearest_fish)
-            self.remaining_rest_time = self.rest_time
+            if self.model.kill(nearest_fish, self.vision * 2, SHARK_KILL, self):
+                if verbose:
+                    print("FISH EATEN")
+                self.remaining_rest_time = self.rest_time
 
         elif d_nearest_fish <= self.vision and not self.rest:
             if verbose:
@@ -142,10 +194,9 @@ class Shark(mesa.Agent):
             if verbose:
                 print("shark explores")
             i_blood_target = None
-            for i_blood, blood in enumerate(self.model.bloods):
-                dist = np.sqrt(
-                    (self.pos[0] - blood.x) ** 2 + (self.pos[1] - blood.y) ** 2
-                )
+            for i_blood, (blood, dist) in enumerate(
+                zip(self.model.bloods, blood_distances)
+            ):
                 if (
                     dist < self.vision + blood.r
                     and self.blood_thresh <= blood.countdown
@@ -177,6 +228,13 @@ class Shark(mesa.Agent):
         if verbose:
             print("speed shark", self.speed)
 
+    def kill_denied(self):
+        """
+        Called when another predator caught the fish claimed by the shark during a staged
+        step. The shark does not rest since it ate nothing.
+        """
+        self.remaining_rest_time = 0
+
     @property
     def rest(self):
         """Property. Return a boolean. True if the shark is resting (It can't eat a fish)."""
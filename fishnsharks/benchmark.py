@@ -0,0 +1,161 @@
+"""
+Benchmark of the backends of the numeric kernels.
+
+Each kernel of fishnsharks.kernels is timed on a synthetic population, then full runs of the
+ocean are timed, for every available backend and both schedulers:
+
+    python -m fishnsharks.benchmark --agents 100000 --steps 100
+
+The runs do not exercise the move kernel, since the agents move one at a time in Python, see
+fishnsharks.kernels. It is only timed on its own.
+"""
+
+import argparse
+import contextlib
+import os
+import time
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from fishnsharks.kernels import (
+    available_backends,
+    get_kernels,
+    mean_heading,
+    move,
+    nearest,
+)
+from fishnsharks.model import OCEAN_HEIGHT, OCEAN_WIDTH, Ocean
+
+SCHEDULERS = ("random", "staged")
+
+
+def best_time(function: Callable, repeat: int = 5) -> float:
+    """Return the shortest of several timings of a function, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def benchmark_kernels(
+    n_agents: int = 10000, repeat: int = 5, seed: int = 0
+) -> Dict[str, Dict[str, float]]:
+    """
+    Time each kernel on a random population.
+
+    The kernels are called once before being timed, so that the compilation of the JIT
+    backend is not counted.
+
+    Args:
+        n_agents (int, optional): The size of the population. Defaults to 10000.
+        repeat (int, optional): The number of timings of each kernel. Defaults to 5.
+        seed (int, optional): The seed of the population. Defaults to 0.
+
+    Returns:
+        Dict[str, Dict[str, float]]: For each backend, the best time of each kernel.
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, (OCEAN_WIDTH, OCEAN_HEIGHT), (n_agents, 2))
+    angle = rng.uniform(0, 2 * np.pi, n_agents)
+    speed = rng.uniform(0, 5, n_agents)
+    max_speed = np.full(n_agents, 5.0)
+    target = np.array([OCEAN_WIDTH / 2, OCEAN_HEIGHT / 2])
+    hidden = rng.random(n_agents) < 0.1
+    bounds = np.array([0, 0, OCEAN_WIDTH, OCEAN_HEIGHT], dtype=float)
+    obstacles = np.array([[0, 0, 120], [300, 300, 50], [450, 150, 30]], dtype=float)
+
+    results = {}
+    for backend in available_backends():
+        kernels = get_kernels(backend)
+        calls = {
+            "mean_heading": lambda: mean_heading(kernels, angle, speed, max_speed),
+            "nearest": lambda: nearest(kernels, points, target, hidden),
+            "move": lambda: move(kernels, points, speed, angle, bounds, obstacles),
+        }
+        results[backend] = {}
+        for name, call in calls.items():
+            call()
+            results[backend][name] = best_time(call, repeat)
+    return results
+
+
+def benchmark_runs(
+    steps: int = 100,
+    seeds: Iterable[int] = range(3),
+    schedulers: Sequence[str] = SCHEDULERS,
+    **params,
+) -> Dict[Tuple[str, str], float]:
+    """
+    Time full runs of the ocean.
+
+    Args:
+        steps (int, optional): The maximum number of steps of each run. Defaults to 100.
+        seeds (Iterable[int], optional): The seeds of the runs. Defaults to range(3).
+        schedulers (Sequence[str], optional): The schedulers to time. Defaults to
+            SCHEDULERS.
+        params: The other arguments of the Ocean constructor.
+
+    Returns:
+        Dict[Tuple[str, str], float]: For each backend and scheduler, the mean time of a step.
+    """
+    seeds = list(seeds)
+    results = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for backend in available_backends():
+            for scheduler in schedulers:
+                Ocean(backend=backend, scheduler=scheduler, **params).step()
+                elapsed, n_steps = 0.0, 0
+                for seed in seeds:
+                    ocean = Ocean(
+                        seed=seed, backend=backend, scheduler=scheduler, **params
+                    )
+                    start = time.perf_counter()
+                    for _ in range(steps):
+                        if not ocean.running:
+                            break
+                        ocean.step()
+                        n_steps += 1
+                    elapsed += time.perf_counter() - start
+                results[backend, scheduler] = elapsed / max(n_steps, 1)
+    return results
+
+
+def main(argv=None):
+    """Print the benchmark of the backends."""
+    parser = argparse.ArgumentParser(
+        description="Compare the backends of the numeric kernels."
+    )
+    parser.add_argument("--agents", type=int, default=10000)
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--n-fish", type=int, default=30)
+    parser.add_argument("--n-sharks", type=int, default=5)
+    parser.add_argument("--n-seagulls", type=int, default=2)
+    parser.add_argument("--fish-space", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"Kernels on {args.agents} agents (ms):")
+    for backend, timings in benchmark_kernels(args.agents).items():
+        print(
+            f"  {backend:6}"
+            + "".join(f"  {name} {1000 * t:8.3f}" for name, t in timings.items())
+        )
+
+    print(f"Runs of {args.steps} steps (ms per step):")
+    runs = benchmark_runs(
+        args.steps,
+        range(args.seeds),
+        n_fish=args.n_fish,
+        n_sharks=args.n_sharks,
+        n_seagulls=args.n_seagulls,
+        fish_space=args.fish_space,
+    )
+    for (backend, scheduler), t in runs.items():
+        print(f"  {backend:6}  {scheduler:7}  {1000 * t:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
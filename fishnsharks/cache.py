@@ -0,0 +1,200 @@
+"""
+On-disk cache of simulation results for parameter sweeps.
+
+A run is identified by a hash of the arguments of the Ocean constructor, the seed, the number
+of steps and the source code of the package, so a cached result is reused only if the same
+code would recompute it. The collected series are stored in compressed npz files, each series
+in the smallest dtype holding it exactly. When the cache grows beyond its size limit, the
+least recently used results are evicted.
+"""
+
+import functools
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fishnsharks.model import Ocean
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+DEFAULT_MAX_BYTES = 256 * 2**20
+STEP_KEY = "step"
+STOP_REASON_KEY = "stop_reason"
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    """Return a hash of the Python sources of the package."""
+    digest = hashlib.sha256()
+    for path in sorted(PACKAGE_DIR.rglob("*.py")):
+        digest.update(path.relative_to(PACKAGE_DIR).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def run_key(params: Mapping, seed: int, steps: int) -> str:
+    """
+    Compute the key of a run.
+
+    Args:
+        params (Mapping): The arguments of the Ocean constructor, except the seed. They must be
+            serializable to JSON, or have a repr describing them, like the termination
+            criteria.
+        seed (int): The seed of the run.
+        steps (int): The number of steps of the run.
+
+    Returns:
+        str: The hexadecimal hash of the run.
+    """
+    description = json.dumps(
+        {
+            "params": params,
+            "seed": seed,
+            "steps": steps,
+            "code": code_version(),
+        },
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+def _compact(values: np.ndarray) -> np.ndarray:
+    """Return the values in the smallest dtype holding them exactly."""
+    if values.dtype.kind not in "iuf" or not len(values):
+        return values
+    if values.dtype.kind == "f":
+        # Only integral series are downcast: a smaller float type would round them.
+        if not (np.isfinite(values).all() and np.array_equal(values, np.round(values))):
+            return values
+        values = values.astype(np.int64)
+    return values.astype(np.min_scalar_type(-np.abs(values).max() - 1))
+
+
+class ResultCache:
+    """Directory of cached results, evicting the least recently used ones."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Standard constructor for the ResultCache class.
+
+        Args:
+            directory (str): The directory of the cache, created if needed.
+            max_bytes (int, optional): The size above which results are evicted. Defaults to
+                DEFAULT_MAX_BYTES.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """Return the cached series of a run, or None if it is not in the cache."""
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                series = {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            return None
+        os.utime(path)
+        return series
+
+    def put(self, key: str, series: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Store the series of a run, evicting old results if needed, and return them."""
+        compact = {
+            name: _compact(np.asarray(values)) for name, values in series.items()
+        }
+        fd, tmp = tempfile.mkstemp(suffix=".npz", dir=self.directory)
+        with os.fdopen(fd, "wb") as file:
+            np.savez_compressed(file, **compact)
+        os.replace(tmp, self._path(key))
+        self.evict()
+        return compact
+
+    def evict(self):
+        """Remove the least recently used results until the cache fits in max_bytes."""
+        entries = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def nbytes(self) -> int:
+        """Return the size of the cached results."""
+        return sum(path.stat().st_size for path in self.directory.glob("*.npz"))
+
+    def run(self, seed: int, steps: int, **params) -> Dict[str, np.ndarray]:
+        """
+        Return the series of a run, simulating it only if it is not in the cache.
+
+        Args:
+            seed (int): The seed of the run.
+            steps (int): The maximum number of steps of the run.
+            params: The other arguments of the Ocean constructor.
+
+        Returns:
+            Dict[str, np.ndarray]: The steps at which the series were collected, under
+                STEP_KEY, the values of each series, and the reason why the run stopped under
+                STOP_REASON_KEY, empty if it reached the given number of steps.
+        """
+        if params.get("event_log") is not None:
+            raise ValueError("Runs writing an event log cannot be cached")
+        key = run_key(params, seed, steps)
+        series = self.get(key)
+        if series is not None:
+            self.hits += 1
+            return series
+
+        self.misses += 1
+        ocean = Ocean(seed=seed, **params)
+        for _ in range(steps):
+            if not ocean.running:
+                break
+            ocean.step()
+        series = {}
+        for name in ocean.data_collector.histories:
+            series[STEP_KEY], series[name] = ocean.data_collector.series(name)
+        series[STOP_REASON_KEY] = np.array(ocean.stop_reason or "")
+        return self.put(key, series)
+
+    def sweep(
+        self, grid: Mapping[str, Sequence], seeds: Iterable[int], steps: int, **params
+    ) -> Iterator[Tuple[dict, int, Dict[str, np.ndarray]]]:
+        """
+        Run every combination of parameters and seeds, reusing the cached runs.
+
+        Args:
+            grid (Mapping[str, Sequence]): The values taken by each swept argument of the Ocean
+                constructor.
+            seeds (Iterable[int]): The seeds of the runs of each combination.
+            steps (int): The maximum number of steps of each run.
+            params: The arguments of the Ocean constructor shared by every run.
+
+        Yields:
+            Tuple[dict, int, Dict[str, np.ndarray]]: The swept arguments, the seed and the
+                series of each run.
+        """
+        seeds = list(seeds)
+        names = list(grid)
+        for values in itertools.product(*(grid[name] for name in names)):
+            cell = dict(zip(names, values))
+            for seed in seeds:
+                yield cell, seed, self.run(seed, steps, **params, **cell)
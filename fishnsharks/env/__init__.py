@@ -1,3 +1,3 @@
-from env.land import Land
-from env.sand import Sand
-from env.blood import Blood
\ No newline at end of file
+from fishnsharks.env.land import Land
+from fishnsharks.env.sand import Sand
+from fishnsharks.env.blood import Blood
@@ -1,4 +1,6 @@
 class Blood:
+    __slots__ = ("x", "y", "r", "rmin", "rmax", "duration", "countdown")
+
     def __init__(self, x: float, y: float, rmin: float, rmax: float, duration: int):
         """
         Standard constructor for the Blood class.
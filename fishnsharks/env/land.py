@@ -1,4 +1,6 @@
 class Land:
+    __slots__ = ("x", "y", "r")
+
     def __init__(self, x: float, y: float, r: float):
         """
         Standard constructor for the Land class.
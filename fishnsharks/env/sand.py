@@ -1,4 +1,6 @@
 class Sand:
+    __slots__ = ("pos", "r")
+
     def __init__(self, x: float, y: float, r: float):
         """
         Standard constructor for the Sand class.
@@ -0,0 +1,126 @@
+"""
+Binary log of the predation events of a run.
+
+Each event is stored as a fixed-size record of EVENT_DTYPE. Records are buffered in memory
+and appended to the file in batches, after a small header identifying the format. The file
+can be read back as NumPy arrays with read_events.
+
+The step of an event is the number of steps completed once the step during which it happened
+is over, the convention of the population history: an event of step n explains the change of
+the populations between the samples of steps n - 1 and n.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+MAGIC = b"FNSEVT01"
+
+EVENT_DTYPE = np.dtype(
+    [
+        ("step", "<i4"),
+        ("type", "u1"),
+        ("predator", "<i8"),
+        ("prey", "<i8"),
+        ("x", "<f4"),
+        ("y", "<f4"),
+    ]
+)
+
+# Event types
+SHARK_KILL = 1
+SEAGULL_KILL = 2
+STRANDING = 3
+
+EVENT_NAMES = {
+    SHARK_KILL: "shark_kill",
+    SEAGULL_KILL: "seagull_kill",
+    STRANDING: "stranding",
+}
+
+# Id recorded as predator when there is none, e.g. for a stranding.
+NO_AGENT = -1
+
+
+class EventLog:
+    """Append-only writer of predation events."""
+
+    def __init__(self, path: str, buffer_size: int = 4096, append: bool = False):
+        """
+        Open the log.
+
+        Args:
+            path (str): The path of the file.
+            buffer_size (int, optional): The number of events kept in memory before being
+                written to the file. Defaults to 4096.
+            append (bool, optional): Whether to append the events to an existing log
+                instead of overwriting the file. Defaults to False.
+        """
+        self.path = path
+        self._file = open(path, "ab" if append else "wb")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        else:
+            with open(path, "rb") as file:
+                is_log = file.read(len(MAGIC)) == MAGIC
+            if not is_log:
+                self._file.close()
+                raise ValueError(f"{path} is not an event log")
+        self._buffer = np.zeros(buffer_size, dtype=EVENT_DTYPE)
+        self._size = 0
+
+    def record(
+        self, step: int, event_type: int, predator: int, prey: int, x: float, y: float
+    ):
+        """
+        Add an event to the log.
+
+        Args:
+            step (int): The number of steps completed at the end of the step during which
+                the event happened.
+            event_type (int): The type of the event, e.g. SHARK_KILL.
+            predator (int): The id of the predator, or NO_AGENT.
+            prey (int): The id of the prey.
+            x (float): The x coordinate of the event.
+            y (float): The y coordinate of the event.
+        """
+        self._buffer[self._size] = (step, event_type, predator, prey, x, y)
+        self._size += 1
+        if self._size == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        """Write the buffered events to the file."""
+        if self._size:
+            self._file.write(self._buffer[: self._size].tobytes())
+            self._size = 0
+        self._file.flush()
+
+    def close(self):
+        """Write the buffered events and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_events(path: str) -> Dict[str, np.ndarray]:
+    """
+    Read a log written by EventLog.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        Dict[str, np.ndarray]: One array per field of EVENT_DTYPE.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an event log")
+        events = np.fromfile(file, dtype=EVENT_DTYPE)
+    return {name: events[name] for name in EVENT_DTYPE.names}
@@ -0,0 +1,173 @@
+"""
+Memory-bounded history of the model-level series.
+
+A MultiResolutionHistory keeps the most recent samples of a series at full resolution and
+older samples averaged over buckets of increasing size, each resolution in a ring buffer of
+fixed capacity. The memory used by the history, and the number of points it returns, do not
+depend on the length of the run.
+"""
+
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_FACTORS = (1, 10, 100)
+
+
+class RingBuffer:
+    """Fixed capacity buffer of (step, value) samples, overwriting the oldest ones."""
+
+    __slots__ = ("steps", "values", "start", "size")
+
+    def __init__(self, capacity: int):
+        self.steps = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.start = 0
+        self.size = 0
+
+    def append(self, step: int, value: float):
+        capacity = len(self.values)
+        i = (self.start + self.size) % capacity
+        self.steps[i] = step
+        self.values[i] = value
+        if self.size < capacity:
+            self.size += 1
+        else:
+            self.start = (self.start + 1) % capacity
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the steps and values of the samples, from the oldest to the newest."""
+        order = (self.start + np.arange(self.size)) % len(self.values)
+        return self.steps[order], self.values[order]
+
+
+class MultiResolutionHistory:
+    """History of one series at several resolutions."""
+
+    def __init__(self, capacity: int, factors: Sequence[int] = DEFAULT_FACTORS):
+        """
+        Standard constructor for the MultiResolutionHistory class.
+
+        Args:
+            capacity (int): The number of samples kept at each resolution.
+            factors (Sequence[int], optional): The number of samples averaged together at each
+                resolution, the first one being 1. Defaults to DEFAULT_FACTORS.
+        """
+        self.factors = tuple(factors)
+        self.levels = [RingBuffer(capacity) for _ in self.factors]
+        self._sums = [0.0] * len(self.factors)
+        self._counts = [0] * len(self.factors)
+
+    def append(self, step: int, value: float):
+        """Add a sample to the history."""
+        for i, factor in enumerate(self.factors):
+            self._sums[i] += value
+            self._counts[i] += 1
+            if self._counts[i] == factor:
+                self.levels[i].append(step, self._sums[i] / factor)
+                self._sums[i] = 0.0
+                self._counts[i] = 0
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the history from the oldest to the newest sample.
+
+        Each resolution only contributes the samples older than those of the finer ones.
+        """
+        steps, values = [], []
+        oldest = None
+        for level in self.levels:
+            level_steps, level_values = level.arrays()
+            if oldest is not None:
+                older = level_steps < oldest
+                level_steps, level_values = level_steps[older], level_values[older]
+            if len(level_steps):
+                oldest = (
+                    level_steps[0] if oldest is None else min(oldest, level_steps[0])
+                )
+            steps.append(level_steps)
+            values.append(level_values)
+        return np.concatenate(steps[::-1]), np.concatenate(values[::-1])
+
+
+class FullHistory:
+    """History of one series keeping every sample."""
+
+    def __init__(self):
+        self.steps = []
+        self.values = []
+
+    def append(self, step: int, value: float):
+        """Add a sample to the history."""
+        self.steps.append(step)
+        self.values.append(value)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the history from the oldest to the newest sample."""
+        return np.array(self.steps, dtype=np.int64), np.array(self.values)
+
+
+class HistoryCollector:
+    """
+    Collector of model-level series, standing in for mesa's DataCollector.
+
+    With a capacity, the series are kept in MultiResolutionHistory objects. Without, every
+    sample is kept like the DataCollector does.
+    """
+
+    def __init__(
+        self,
+        model_reporters: Dict[str, Callable],
+        capacity: Optional[int] = None,
+        factors: Sequence[int] = DEFAULT_FACTORS,
+    ):
+        """
+        Standard constructor for the HistoryCollector class.
+
+        Args:
+            model_reporters (Dict[str, Callable]): The functions computing each series from
+                the model.
+            capacity (int, optional): The number of samples kept at each resolution. Defaults
+                to None, every sample is kept.
+            factors (Sequence[int], optional): The resolutions of the history. Defaults to
+                DEFAULT_FACTORS.
+        """
+        self.model_reporters = model_reporters
+        self.histories = {
+            name: (
+                FullHistory()
+                if capacity is None
+                else MultiResolutionHistory(capacity, factors)
+            )
+            for name in model_reporters
+        }
+
+    def collect(self, model):
+        """Add the current values of the series to their history."""
+        step = model.schedule.steps
+        for name, reporter in self.model_reporters.items():
+            self.histories[name].append(step, reporter(model))
+
+    def series(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the steps and values of a series, from the oldest to the newest."""
+        return self.histories[name].arrays()
+
+    @property
+    def model_vars(self) -> Dict[str, list]:
+        """The values of each series, like DataCollector.model_vars."""
+        return {
+            name: (
+                history.values
+                if isinstance(history, FullHistory)
+                else history.arrays()[1].tolist()
+            )
+            for name, history in self.histories.items()
+        }
+
+    def get_model_vars_dataframe(self):
+        """Return the series as a pandas DataFrame indexed by step."""
+        import pandas as pd
+
+        columns = {name: self.series(name)[1] for name in self.histories}
+        steps = next(iter(self.histories.values())).arrays()[0]
+        return pd.DataFrame(columns, index=steps)
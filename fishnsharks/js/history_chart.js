@@ -0,0 +1,61 @@
+var HistoryChartModule = function(series, canvas_width, canvas_height) {
+	// Create the tag:
+	var canvas_tag = "<canvas width='" + canvas_width + "' height='" + canvas_height + "' ";
+	canvas_tag += "style='border:1px dotted'></canvas>";
+	// Append it to #elements
+	var canvas = $(canvas_tag)[0];
+	$("#elements").append(canvas);
+	var context = canvas.getContext("2d");
+
+	var datasets = [];
+	for (var i in series) {
+		datasets.push({
+			label: series[i].Label,
+			borderColor: series[i].Color,
+			backgroundColor: series[i].Color,
+			pointRadius: 0,
+			data: []
+		});
+	}
+
+	var chart = new Chart(context, {
+		type: 'line',
+		data: {
+			labels: [],
+			datasets: datasets
+		},
+		options: {
+			responsive: true,
+			animation: false,
+			scales: {
+				x: {
+					display: true,
+					ticks: {
+						maxTicksLimit: 11
+					}
+				},
+				y: {
+					display: true
+				}
+			}
+		}
+	});
+
+	// The server sends the whole downsampled history at each step, so the chart is
+	// replaced rather than extended.
+	this.render = function(data) {
+		chart.data.labels = data.steps;
+		for (var i = 0; i < data.values.length; i++) {
+			chart.data.datasets[i].data = data.values[i];
+		}
+		chart.update();
+	};
+
+	this.reset = function() {
+		chart.data.labels = [];
+		chart.data.datasets.forEach(function(dataset) {
+			dataset.data = [];
+		});
+		chart.update();
+	};
+};
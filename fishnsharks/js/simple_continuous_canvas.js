@@ -15,6 +15,8 @@ var ContinuousVisualization = function(height, width, context) {
                     this.drawLine(p.from_x, p.from_y, p.to_x, p.to_y, p.width, p.Color);
                 if (p.Shape =="arrowHead")
                     this.drawArrrowHead(p.x,p.y,p.angle,p.s,p.Color,p.Filled);
+                if (p.Shape == "density")
+                    this.drawDensity(p.rows, p.cols, p.counts, p.max, p.Color);
     		};
 		};
 	};
@@ -75,6 +77,19 @@ var ContinuousVisualization = function(height, width, context) {
         context.restore();
 	};
 
+	// Heatmap of the counts of a grid, row by row from the bottom of the space.
+	this.drawDensity = function(rows, cols, counts, max, color) {
+		var w = width / cols;
+		var h = height / rows;
+		for (var k = 0; k < counts.length; k++) {
+			if (counts[k] == 0)
+				continue;
+			var alpha = 0.15 + 0.85 * counts[k] / max;
+			context.fillStyle = "rgba(" + color + "," + alpha + ")";
+			context.fillRect((k % cols) * w, Math.floor(k / cols) * h, w, h);
+		}
+	};
+
 	this.resetCanvas = function() {
 		context.clearRect(0, 0, height, width);
 		context.beginPath();
@@ -0,0 +1,243 @@
+"""
+Numeric kernels of the step, with an optional JIT-compiled backend.
+
+The "numpy" backend computes the kernels with array operations and is always available. The
+"numba" backend compiles loop versions of the same kernels when numba is installed, which
+avoids the temporary arrays and the repeated passes of the NumPy versions. Both backends give
+the same results up to rounding, the order of the floating-point operations being different.
+numba is only imported, and the kernels compiled, the first time its backend is requested.
+
+Within a step, the heading sums compute the mean heading of the fish and the nearest kernel
+the nearest-fish scan of the staged scheduler. The move kernel is only reached through
+utils.move_batch and utils.go_to_batch, which no agent calls: the agents still move one at a
+time with utils.move, under both schedulers, so the backend does not change their movement.
+"""
+
+import functools
+import importlib.util
+import warnings
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+BACKENDS = ("numpy", "numba")
+
+
+class Kernels(NamedTuple):
+    """The kernels of a backend."""
+
+    name: str
+    heading_sums: Callable
+    nearest: Callable
+    move: Callable
+
+
+def _heading_sums_numpy(angle, speed, max_speed):
+    speed_ratio = speed / max_speed
+    count = speed_ratio.sum(dtype=np.float64)
+    y_sum = (speed_ratio * np.sin(angle)).sum(dtype=np.float64)
+    x_sum = (speed_ratio * np.cos(angle)).sum(dtype=np.float64)
+    return count, y_sum, x_sum
+
+
+def _nearest_numpy(points, x, y, hidden):
+    if not len(points):
+        return -1, np.inf
+    dist = np.sqrt((points[:, 0] - x) ** 2 + (points[:, 1] - y) ** 2)
+    dist[hidden] = np.inf
+    i = int(np.argmin(dist))
+    if not np.isfinite(dist[i]):
+        return -1, np.inf
+    return i, float(dist[i])
+
+
+def _move_numpy(points, speed, angle, bounds, obstacles, max_retries):
+    speed = speed.copy()
+    direction = np.stack([np.cos(angle), np.sin(angle)], axis=1)
+    new_points = points.copy()
+    todo = np.arange(len(points))
+    for _ in range(max_retries + 1):
+        candidates = np.clip(
+            points[todo] + direction[todo] * speed[todo, None], bounds[:2], bounds[2:]
+        )
+        blocked = np.zeros(len(todo), dtype=bool)
+        for x, y, r in obstacles:
+            blocked |= (
+                np.sqrt((candidates[:, 0] - x) ** 2 + (candidates[:, 1] - y) ** 2) <= r
+            )
+        new_points[todo[~blocked]] = candidates[~blocked]
+        todo = todo[blocked]
+        if not len(todo):
+            break
+        speed[todo] /= 2
+    return new_points
+
+
+NUMPY_KERNELS = Kernels("numpy", _heading_sums_numpy, _nearest_numpy, _move_numpy)
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_kernels() -> Optional[Kernels]:
+    """Compile the numba kernels, or return None if numba is not installed."""
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(cache=True)
+    def _heading_sums_numba(angle, speed, max_speed):
+        count = 0.0
+        y_sum = 0.0
+        x_sum = 0.0
+        for i in range(len(angle)):
+            speed_ratio = speed[i] / max_speed[i]
+            count += speed_ratio
+            y_sum += speed_ratio * np.sin(angle[i])
+            x_sum += speed_ratio * np.cos(angle[i])
+        return count, y_sum, x_sum
+
+    @numba.njit(cache=True)
+    def _nearest_numba(points, x, y, hidden):
+        nearest = -1
+        d_nearest = np.inf
+        for i in range(len(points)):
+            if hidden[i]:
+                continue
+            dist = np.sqrt((points[i, 0] - x) ** 2 + (points[i, 1] - y) ** 2)
+            if dist < d_nearest:
+                nearest = i
+                d_nearest = dist
+        return nearest, d_nearest
+
+    @numba.njit(cache=True)
+    def _move_numba(points, speed, angle, bounds, obstacles, max_retries):
+        new_points = points.copy()
+        for i in range(len(points)):
+            step = speed[i]
+            cos, sin = np.cos(angle[i]), np.sin(angle[i])
+            for _ in range(max_retries + 1):
+                x = min(max(points[i, 0] + cos * step, bounds[0]), bounds[2])
+                y = min(max(points[i, 1] + sin * step, bounds[1]), bounds[3])
+                blocked = False
+                for k in range(len(obstacles)):
+                    dx = x - obstacles[k, 0]
+                    dy = y - obstacles[k, 1]
+                    if np.sqrt(dx**2 + dy**2) <= obstacles[k, 2]:
+                        blocked = True
+                        break
+                if not blocked:
+                    new_points[i, 0] = x
+                    new_points[i, 1] = y
+                    break
+                step /= 2
+        return new_points
+
+    return Kernels("numba", _heading_sums_numba, _nearest_numba, _move_numba)
+
+
+def available_backends() -> Tuple[str, ...]:
+    """Return the names of the backends usable in this environment."""
+    has_numba = importlib.util.find_spec("numba") is not None
+    return tuple(name for name in BACKENDS if name == "numpy" or has_numba)
+
+
+def get_kernels(backend: str = "numpy") -> Kernels:
+    """
+    Return the kernels of a backend.
+
+    Args:
+        backend (str, optional): "numpy", "numba", or "auto" for numba when it is installed.
+            Defaults to "numpy".
+
+    Returns:
+        Kernels: The kernels. If numba is requested but not installed, a warning is emitted
+            and the NumPy kernels are returned.
+    """
+    if backend not in BACKENDS + ("auto",):
+        raise ValueError(
+            f"Unknown backend {backend!r}, expected one of {BACKENDS + ('auto',)}"
+        )
+    if backend == "numpy":
+        return NUMPY_KERNELS
+    kernels = _numba_kernels()
+    if kernels is None:
+        if backend == "numba":
+            warnings.warn("numba is not installed, falling back to the numpy backend")
+        return NUMPY_KERNELS
+    return kernels
+
+
+def mean_heading(
+    kernels: Kernels, angle: np.ndarray, speed: np.ndarray, max_speed: np.ndarray
+) -> Optional[float]:
+    """
+    Compute the mean direction of agents, weighted by their speed ratio.
+
+    The accumulation is done in float64 whatever the storage precision.
+
+    Args:
+        kernels (Kernels): The backend.
+        angle (np.ndarray): The directions of the agents.
+        speed (np.ndarray): The speeds of the agents.
+        max_speed (np.ndarray): The maximum speeds of the agents.
+
+    Returns:
+        float: The mean direction, or None if no agent is moving.
+    """
+    count, y_sum, x_sum = kernels.heading_sums(angle, speed, max_speed)
+    if count <= 0:
+        return None
+    return float(np.arctan2(y_sum / count, x_sum / count))
+
+
+def nearest(
+    kernels: Kernels,
+    points: np.ndarray,
+    target: np.ndarray,
+    hidden: Optional[np.ndarray] = None,
+) -> Tuple[int, float]:
+    """
+    Find the position closest to a target.
+
+    Args:
+        kernels (Kernels): The backend.
+        points (np.ndarray): Array of shape (N, 2) of positions.
+        target (np.ndarray): The target position.
+        hidden (np.ndarray, optional): Boolean array of the positions to ignore. Defaults to
+            None, every position is considered.
+
+    Returns:
+        Tuple[int, float]: The index of the closest position and its distance to the target,
+            or -1 and inf if there is none.
+    """
+    if hidden is None:
+        hidden = np.zeros(len(points), dtype=bool)
+    return kernels.nearest(points, target[0], target[1], hidden)
+
+
+def move(
+    kernels: Kernels,
+    points: np.ndarray,
+    speed: np.ndarray,
+    angle: np.ndarray,
+    bounds: np.ndarray,
+    obstacles: np.ndarray,
+    max_retries: int = 10,
+) -> np.ndarray:
+    """
+    Compute the next positions of agents, see utils.move_batch.
+
+    Args:
+        kernels (Kernels): The backend.
+        points (np.ndarray): Array of shape (N, 2) of the initial positions.
+        speed (np.ndarray): Array of shape (N,) of the speeds, in the dtype of the points.
+        angle (np.ndarray): Array of shape (N,) of the directions.
+        bounds (np.ndarray): The limits of the space, (x_min, y_min, x_max, y_max).
+        obstacles (np.ndarray): Array of shape (K, 3) of the centers and radii of the
+            obstacles.
+        max_retries (int, optional): The number of times the speed is halved. Defaults to 10.
+
+    Returns:
+        np.ndarray: Array of shape (N, 2) of the new positions.
+    """
+    return kernels.move(points, speed, angle, bounds, obstacles, max_retries)
@@ -0,0 +1,388 @@
+import copy
+import random
+from operator import attrgetter
+from typing import Optional, Sequence, Tuple
+
+import mesa
+import numpy as np
+from mesa import space
+from mesa.time import RandomActivation
+
+from fishnsharks.agents import Agent, Fish, Shark, Seagull
+from fishnsharks.env import Blood, Land, Sand
+from fishnsharks.events import NO_AGENT, EventLog
+from fishnsharks.history import HistoryCollector
+from fishnsharks.kernels import get_kernels
+from fishnsharks.placement import place_fish, shores, uniform
+from fishnsharks.staged import SenseActActivation
+from fishnsharks.state import AgentArrays, BloodArrays, check_precision, mean_heading
+from fishnsharks.termination import (
+    Criterion,
+    Extinction,
+    MaxSteps,
+    first_met,
+)
+from fishnsharks.utils import distanceL2, slots_sizeof
+from fishnsharks.visibility import visibility_map
+
+OCEAN_WIDTH = 600
+OCEAN_HEIGHT = 600
+MAX_STEPS = 1000
+# Number of samples kept at each resolution of the history of unbounded runs.
+UNBOUNDED_HISTORY_SIZE = 500
+
+
+class Ocean(mesa.Model):
+    """
+    Environment in which fish and sharks will evolve.
+
+    """
+
+    def __init__(
+        self,
+        n_fish: int,
+        n_sharks: int,
+        n_seagulls: int,
+        fish_space: int,
+        width: int = OCEAN_WIDTH,
+        height: int = OCEAN_HEIGHT,
+        following_rate: float = 0.8,
+        fish_vision: int = 40,
+        fish_speed: float = 10,
+        shark_rest_time: int = 5,
+        shark_slowing_factor: float = 0.2,
+        shark_stranded_proba: float = 0.05,
+        precision: str = "float64",
+        seed: int = None,
+        event_log: str = None,
+        fish_placement: str = "grid",
+        n_schools: int = 1,
+        occlusion: bool = False,
+        visibility_cell: float = 20,
+        max_steps: Optional[int] = MAX_STEPS,
+        history_size: Optional[int] = None,
+        scheduler: str = "random",
+        backend: str = "numpy",
+        termination: Sequence[Criterion] = (),
+    ):
+        """
+        Standard constructor to create the Ocean class.
+
+        Args:
+            n_fish (int): The number of fish in the ocean at the beginning.
+            n_sharks (int): The number of sharks in the ocean at the beginning.
+            n_seagull (int): The number of seagulls in the environment at the beginning.
+            fish_space (int): The distance between two fish at the begininning.
+            width (int, optional): The width of the ocean. Defaults to OCEAN_WIDTH.
+            height (int, optional): The height of the ocean. Defaults to OCEAN_HEIGHT.
+            following_rate (float, optional): Ratio that represents the tendency of a fish to
+                follow the group rather than choosing its own direction. Defaults to 0.8.
+            fish_vision (int, optional): Maximum viewing distance of a fish. Defaults to 40.
+            fish_speed (int, optional): Maximum travel distance per step for a fish. Defaults to 10.
+            shark_rest_time (int, optional): Time during which a shark can't eat a fish after
+                having eaten one. Default to 5.
+            shark_slowing_factor (float, optional): Value between 0 and 1. The factor by which the
+                speed of a shark decreases on the sand. Default to 0.5.
+            stranded_proba (float, optional): The probability of the shark to be stranded at each time step when in the sand. Default to 0.1.
+            precision (str, optional): The dtype of the arrays into which the state of the
+                populations is copied at each step, "float64" or "float32", see
+                fishnsharks.state. The agents keep their own state in Python floats, so
+                "float32" does not reduce the memory of a run, it only halves these copies.
+                Defaults to "float64".
+            seed (int, optional): Seed of the random generators. The generators of the random
+                and numpy.random modules are reseeded as the agents use them. Defaults to None.
+            event_log (str, optional): Path of the file in which the predation events are
+                logged, overwritten if it exists. Defaults to None, no event is logged.
+            fish_placement (str, optional): The initial placement of the fish, "grid",
+                "poisson", "clustered" or "schools". See fishnsharks.placement. Defaults to
+                "grid".
+            n_schools (int, optional): The number of schools for the "clustered" and "schools"
+                placements. Defaults to 1.
+            occlusion (bool, optional): Whether the obstacles block the view of the agents.
+                Defaults to False.
+            visibility_cell (float, optional): The side of the cells of the visibility table
+                used when occlusion is enabled. The table grows with the fourth power of
+                the number of cells per side and is limited to
+                visibility.MAX_TABLE_BYTES. Defaults to 20.
+            max_steps (int, optional): The number of steps after which the run stops. None
+                for an unbounded run. Defaults to MAX_STEPS.
+            history_size (int, optional): The number of samples of the population series kept
+                at each resolution, older samples being averaged over 10 then 100 steps.
+                Defaults to None, every sample is kept, except for unbounded runs which keep
+                UNBOUNDED_HISTORY_SIZE samples per resolution.
+            scheduler (str, optional): "random" to activate the agents one after the other in
+                a random order, or "staged" to compute the perception of all the agents
+                before they act, see fishnsharks.staged. Defaults to "random".
+            backend (str, optional): The backend of the numeric kernels, "numpy", "numba"
+                or "auto", see fishnsharks.kernels. Defaults to "numpy".
+            termination (Sequence[Criterion], optional): Criteria stopping the run early, in
+                addition to max_steps and the extinction of the fish, see
+                fishnsharks.termination. Defaults to (), the run stops at max_steps or when no
+                fish is left.
+        """
+        mesa.Model.__init__(self)
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+            self.random = random.Random(seed)
+        self.dtype = check_precision(precision)
+        self.kernels = get_kernels(backend)
+        self.event_log = EventLog(event_log) if event_log is not None else None
+        self.width = width
+        self.height = height
+        self.space = mesa.space.ContinuousSpace(width, height, False)
+
+        if scheduler == "random":
+            self.schedule = RandomActivation(self)
+        elif scheduler == "staged":
+            self.schedule = SenseActActivation(self)
+        else:
+            raise ValueError(
+                f"Unknown scheduler {scheduler!r}, expected 'random' or 'staged'"
+            )
+        self._claims = None
+
+        self.sands = []
+        self.obstacles = []
+        self.bloods = []
+
+        # Environment
+        self.sands.append(Sand(150, 0, 40))
+        self.sands.append(Sand(100, 50, 40))
+        self.sands.append(Sand(50, 100, 40))
+        self.sands.append(Sand(0, 150, 40))
+        self.sands.append(Sand(450, 600, 40))
+        self.sands.append(Sand(500, 550, 40))
+        self.sands.append(Sand(550, 500, 40))
+        self.sands.append(Sand(600, 450, 40))
+        self.sands.append(Sand(600, 600, 120))
+        self.obstacles.append(Land(0, 0, 120))
+        self.visibility = (
+            visibility_map(width, height, self.obstacles, visibility_cell)
+            if occlusion
+            else None
+        )
+
+        # Agents
+        fish_positions = place_fish(
+            fish_placement,
+            n_fish,
+            fish_space,
+            width,
+            height,
+            self.obstacles,
+            n_schools,
+        )
+        for x, y in fish_positions.tolist():
+            self.schedule.add(
+                Fish(
+                    self,
+                    x,
+                    y,
+                    self.next_id(),
+                    following_rate,
+                    vision=fish_vision,
+                    max_speed=fish_speed,
+                )
+            )
+
+        for x, y in uniform(n_sharks, width, height, self.obstacles).tolist():
+            self.schedule.add(
+                Shark(
+                    self,
+                    x,
+                    y,
+                    self.next_id(),
+                    rest_time=shark_rest_time,
+                    slowing_factor=shark_slowing_factor,
+                    stranded_proba=shark_stranded_proba,
+                )
+            )
+
+        for x, y in shores(n_seagulls, width, height).tolist():
+            self.schedule.add(Seagull(self, x, y, self.next_id()))
+
+        self.max_steps = max_steps
+        self.termination = [Extinction()] + [copy.copy(c) for c in termination]
+        if max_steps is not None:
+            self.termination.insert(0, MaxSteps(max_steps))
+        self.stop_reason = None
+        if history_size is None and max_steps is None:
+            history_size = UNBOUNDED_HISTORY_SIZE
+        self.data_collector = HistoryCollector(
+            model_reporters={
+                "nb_fish": lambda m: len(m.list_fish),
+                "nb_sharks": lambda m: len(m.list_sharks),
+                "nb_seagulls": lambda m: len(m.list_seagulls),
+            },
+            capacity=history_size,
+        )
+        self.update_data()
+
+    def step(self):
+        """Update the environment doing one step."""
+        # compute mean direction of fish, weighted with fish' speed.
+        self.mean_fish_angle = mean_heading(self.fish_arrays, self.kernels)
+        if self.mean_fish_angle is None:
+            self.mean_fish_angle = np.random.random() * np.pi * 2
+
+        self.schedule.step()
+        to_remove = []
+        for i, blood in enumerate(self.bloods):
+            if blood.countdown == 0:
+                to_remove.append(i)
+            blood.step()
+        for i in range(len(to_remove) - 1, -1, -1):
+            del self.bloods[to_remove[i]]
+        self.update_data()
+        self.stop_reason = first_met(self.termination, self)
+        if self.stop_reason is not None:
+            self.running = False
+            self.close()
+
+    def close(self):
+        """Write the pending predation events to the event log and close it."""
+        if self.event_log is not None:
+            self.event_log.close()
+
+    def update_data(self):
+        """Update the data collector."""
+        self.list_fish = []
+        self.list_sharks = []
+        self.list_seagulls = []
+
+        # Sorted by id, so that the staged scheduler does not depend on the order in which
+        # the agents were added.
+        for agent in sorted(self.schedule.agents, key=attrgetter("unique_id")):
+            if agent.__class__.__name__ == "Fish":
+                self.list_fish.append(agent)
+            elif agent.__class__.__name__ == "Shark":
+                self.list_sharks.append(agent)
+            elif agent.__class__.__name__ == "Seagull":
+                self.list_seagulls.append(agent)
+
+        self.fish_arrays = AgentArrays(self.list_fish, self.dtype, kinematics=True)
+        self.shark_arrays = AgentArrays(self.list_sharks, self.dtype)
+        self.seagull_arrays = AgentArrays(self.list_seagulls, self.dtype)
+        self.blood_arrays = BloodArrays(self.bloods, self.dtype)
+
+        self.data_collector.collect(self)
+
+    def can_see(self, pos1: Tuple[float, float], pos2: Tuple[float, float]) -> bool:
+        """
+        Test whether the line of sight between two positions is free of obstacles.
+
+        Args:
+            pos1 (Tuple[float, float]): The first position.
+            pos2 (Tuple[float, float]): The second position.
+
+        Returns:
+            bool: Always True if occlusion is disabled.
+        """
+        if self.visibility is None:
+            return True
+        return self.visibility.visible(pos1, pos2)
+
+    def kill(
+        self,
+        agent: Agent,
+        blood_radius: float,
+        event_type: int,
+        predator: Agent = None,
+    ) -> bool:
+        """
+        Remove an agent from the ocean, leave blood where it was and log the event.
+
+        Several predators may try to eat the same fish during a step since the lists of agents
+        are only updated at the end of the step. Only the first one succeeds. Between
+        start_claims and resolve_claims, the death is only claimed.
+
+        Args:
+            agent (Agent): The agent to remove.
+            blood_radius (float): The final radius of the blood.
+            event_type (int): The type of the event, see fishnsharks.events.
+            predator (Agent, optional): The agent responsible for the death. Defaults to
+                None.
+
+        Returns:
+            bool: False if the agent had already been removed.
+        """
+        if not self.is_alive(agent):
+            return False
+        if self._claims is not None:
+            self._claims.append((agent, blood_radius, event_type, predator))
+            return True
+        self.bloods.append(Blood(*agent.pos, 1, blood_radius, 40))
+        self.schedule.remove(agent)
+        if self.event_log is not None:
+            self.event_log.record(
+                self.schedule.steps + 1,
+                event_type,
+                predator.unique_id if predator is not None else NO_AGENT,
+                agent.unique_id,
+                *agent.pos,
+            )
+        return True
+
+    def is_alive(self, agent: Agent) -> bool:
+        """Test whether an agent is still in the ocean."""
+        return agent.unique_id in self.schedule._agents
+
+    def start_claims(self):
+        """Defer the deaths until resolve_claims is called."""
+        self._claims = []
+
+    def resolve_claims(self):
+        """
+        Apply the deaths claimed since start_claims.
+
+        A prey claimed by several predators goes to the closest one, then to the one with the
+        lowest id. The kill_denied method of the other predators is called.
+        """
+        claims, self._claims = self._claims, None
+        by_prey = {}
+        for claim in claims:
+            by_prey.setdefault(claim[0].unique_id, []).append(claim)
+
+        for prey_claims in by_prey.values():
+            prey = prey_claims[0][0]
+
+            def priority(claim):
+                predator = claim[3]
+                if predator is None:
+                    return (-1.0, -1)
+                return (distanceL2(predator.pos, prey.pos), predator.unique_id)
+
+            winner = min(prey_claims, key=priority)
+            self.kill(*winner)
+            for claim in prey_claims:
+                if claim is not winner and claim[3] is not None:
+                    claim[3].kill_denied()
+
+    def memory_report(self) -> dict:
+        """
+        Measure the memory held by the agents of each type.
+
+        Objects shared between agents (the model, parameters passed to every agent, small
+        integers) are only counted once, by the first agent holding them. The arrays into
+        which the state of the fish, sharks and seagulls is copied at each step are reported
+        apart, as they are the only storage depending on the precision.
+
+        Returns:
+            dict: For each agent type, the number of agents, the total number of bytes and
+                the mean number of bytes per agent, and the number of bytes of the arrays of
+                the population under "array_bytes".
+        """
+        report = {}
+        seen = {id(self)}
+        for agent in self.schedule.agents:
+            name = agent.__class__.__name__
+            entry = report.setdefault(name, {"count": 0, "bytes": 0, "array_bytes": 0})
+            entry["count"] += 1
+            entry["bytes"] += slots_sizeof(agent, seen)
+        for arrays in (self.fish_arrays, self.shark_arrays, self.seagull_arrays):
+            if arrays.agents:
+                report[type(arrays.agents[0]).__name__]["array_bytes"] += arrays.nbytes
+        for entry in report.values():
+            entry["bytes_per_agent"] = entry["bytes"] / entry["count"]
+        return report
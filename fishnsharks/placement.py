@@ -0,0 +1,328 @@
+"""
+Vectorized initial placement of the agents.
+
+Each strategy returns an array of shape (n, 2) with positions strictly inside the ocean and
+outside the obstacles (the Land). The arrays can be used to build the agent objects or be
+given directly to an array-based engine.
+"""
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+from fishnsharks.utils import obstacle_mask
+
+# Number of times a strategy draws new candidates before giving up.
+MAX_ATTEMPTS = 100
+
+
+def valid_positions(
+    points: np.ndarray,
+    width: float,
+    height: float,
+    obstacles: Sequence = (),
+    d_safe: float = 1,
+) -> np.ndarray:
+    """
+    Test which positions are inside the ocean and away from the obstacles.
+
+    Args:
+        points (np.ndarray): Array of shape (n, 2) of positions.
+        width (float): The width of the ocean.
+        height (float): The height of the ocean.
+        obstacles (Sequence[Land], optional): The obstacles. Defaults to ().
+        d_safe (float, optional): Distance which extend the obstacle boundaries. Defaults to 1.
+
+    Returns:
+        np.ndarray: Boolean array of shape (n,).
+    """
+    x, y = points[:, 0], points[:, 1]
+    inside = (x > 0) & (y > 0) & (x < width) & (y < height)
+    return inside & ~obstacle_mask(points, obstacles, d_safe)
+
+
+def _box_is_clear(
+    lower: np.ndarray, upper: np.ndarray, obstacles: Sequence, d_safe: float = 1
+) -> bool:
+    """Test whether an axis-aligned box is away from all the obstacles."""
+    for obstacle in obstacles:
+        center = (obstacle.x, obstacle.y)
+        closest = np.clip(center, lower, upper)
+        if ((closest - center) ** 2).sum() <= (obstacle.r + d_safe) ** 2:
+            return False
+    return True
+
+
+def _lattice(n: int, spacing: float) -> np.ndarray:
+    """Offsets of a block of n points filled column by column, as square as possible."""
+    rows = max(math.ceil(math.sqrt(n)), 1)
+    i = np.arange(n)
+    return np.stack([i // rows, i % rows], axis=1) * float(spacing)
+
+
+def grid(
+    n: int,
+    spacing: float,
+    width: float,
+    height: float,
+    obstacles: Sequence = (),
+    rng=np.random,
+) -> np.ndarray:
+    """
+    Place n agents on a square grid at a random place of the ocean.
+
+    The grid is filled column by column so exactly n agents are placed, the last column being
+    incomplete if n is not a square. If no random origin lets the bounding box of the block
+    avoid the obstacles, the n valid nodes of an ocean-wide grid closest to a random center
+    are used.
+
+    Args:
+        n (int): The number of agents.
+        spacing (float): The distance between two neighbours.
+        width (float): The width of the ocean.
+        height (float): The height of the ocean.
+        obstacles (Sequence[Land], optional): The obstacles to avoid. Defaults to ().
+        rng (optional): The random generator. Defaults to numpy.random.
+
+    Returns:
+        np.ndarray: Array of shape (n, 2).
+    """
+    if n == 0:
+        return np.zeros((0, 2))
+    offsets = _lattice(n, spacing)
+    extent = offsets.max(axis=0)
+    free = np.array([width, height]) - extent
+    if (free > 0).all():
+        for _ in range(MAX_ATTEMPTS):
+            origin = rng.random(2) * free
+            if origin.min() > 0 and _box_is_clear(origin, origin + extent, obstacles):
+                return offsets + origin
+
+    origin = rng.random(2) * spacing
+    xs = np.arange(origin[0], width, spacing)
+    ys = np.arange(origin[1], height, spacing)
+    nodes = np.stack(np.meshgrid(xs, ys, indexing="ij"), axis=-1).reshape(-1, 2)
+    nodes = nodes[valid_positions(nodes, width, height, obstacles)]
+    if len(nodes) < n:
+        raise ValueError(f"Cannot place {n} agents {spacing} apart in the ocean")
+    center = nodes[int(rng.random() * len(nodes))]
+    distances = ((nodes - center) ** 2).sum(axis=1)
+    if len(nodes) > n:
+        nodes = nodes[np.argpartition(distances, n - 1)[:n]]
+    return nodes[np.lexsort((nodes[:, 1], nodes[:, 0]))]
+
+
+def poisson_disk(
+    n: int,
+    min_distance: float,
+    width: float,
+    height: float,
+    obstacles: Sequence = (),
+    rng=np.random,
+) -> np.ndarray:
+    """
+    Place n agents uniformly in the ocean, no two of them closer than min_distance.
+
+    One candidate is drawn in each cell of a grid of side min_distance / sqrt(2). A candidate
+    is dropped when it is too close to a candidate of a neighbouring cell with a higher
+    priority, priorities being random. n agents are drawn among the remaining candidates.
+
+    Args:
+        n (int): The number of agents.
+        min_distance (float): The minimal distance between two agents.
+        width (float): The width of the ocean.
+        height (float): The height of the ocean.
+        obstacles (Sequence[Land], optional): The obstacles to avoid. Defaults to ().
+        rng (optional): The random generator. Defaults to numpy.random.
+
+    Returns:
+        np.ndarray: Array of shape (n, 2).
+    """
+    cell = min_distance / math.sqrt(2)
+    cols, rows = math.ceil(width / cell), math.ceil(height / cell)
+    ix, iy = np.meshgrid(np.arange(cols), np.arange(rows), indexing="ij")
+    points = (np.stack([ix, iy], axis=-1) + rng.random((cols, rows, 2))) * cell
+    priority = rng.permutation(cols * rows).reshape(cols, rows)
+
+    # Two points closer than min_distance are at most two cells apart.
+    keep = np.ones((cols, rows), dtype=bool)
+    for dx in range(-2, 3):
+        for dy in range(-2, 3):
+            if dx == 0 and dy == 0:
+                continue
+            src = (
+                slice(max(0, -dx), cols - max(0, dx)),
+                slice(max(0, -dy), rows - max(0, dy)),
+            )
+            dst = (
+                slice(max(0, dx), cols - max(0, -dx)),
+                slice(max(0, dy), rows - max(0, -dy)),
+            )
+            gaps = points[src] - points[dst]
+            too_close = (gaps**2).sum(axis=-1) < min_distance**2
+            keep[src] &= ~(too_close & (priority[dst] > priority[src]))
+
+    points = points[keep]
+    points = points[valid_positions(points, width, height, obstacles)]
+    if len(points) < n:
+        raise ValueError(f"Cannot place {n} agents {min_distance} apart in the ocean")
+    return points[rng.choice(len(points), n, replace=False)]
+
+
+def clustered(
+    n: int,
+    n_clusters: int,
+    spread: float,
+    width: float,
+    height: float,
+    obstacles: Sequence = (),
+    rng=np.random,
+) -> np.ndarray:
+    """
+    Place n agents around n_clusters random centers, with a normal spread around each center.
+
+    Args:
+        n (int): The number of agents.
+        n_clusters (int): The number of clusters.
+        spread (float): The standard deviation of the distance to the center of the cluster.
+        width (float): The width of the ocean.
+        height (float): The height of the ocean.
+        obstacles (Sequence[Land], optional): The obstacles to avoid. Defaults to ().
+        rng (optional): The random generator. Defaults to numpy.random.
+
+    Returns:
+        np.ndarray: Array of shape (n, 2).
+    """
+    centers = uniform(n_clusters, width, height, obstacles, rng)
+    membership = np.arange(n) % n_clusters
+    points = np.empty((n, 2))
+    todo = np.arange(n)
+    for _ in range(MAX_ATTEMPTS):
+        points[todo] = centers[membership[todo]] + rng.normal(0, spread, (len(todo), 2))
+        todo = todo[~valid_positions(points[todo], width, height, obstacles)]
+        if not len(todo):
+            return points
+    raise ValueError(f"Cannot place {n} agents around {n_clusters} clusters")
+
+
+def schools(
+    n: int,
+    n_schools: int,
+    spacing: float,
+    width: float,
+    height: float,
+    obstacles: Sequence = (),
+    rng=np.random,
+) -> np.ndarray:
+    """
+    Place n agents in n_schools grids placed independently in the ocean.
+
+    Args:
+        n (int): The number of agents.
+        n_schools (int): The number of schools.
+        spacing (float): The distance between two neighbours of a school.
+        width (float): The width of the ocean.
+        height (float): The height of the ocean.
+        obstacles (Sequence[Land], optional): The obstacles to avoid. Defaults to ().
+        rng (optional): The random generator. Defaults to numpy.random.
+
+    Returns:
+        np.ndarray: Array of shape (n, 2).
+    """
+    sizes = np.full(n_schools, n // n_schools)
+    sizes[: n % n_schools] += 1
+    return np.concatenate(
+        [grid(size, spacing, width, height, obstacles, rng) for size in sizes]
+    )
+
+
+def uniform(
+    n: int,
+    width: float,
+    height: float,
+    obstacles: Sequence = (),
+    rng=np.random,
+) -> np.ndarray:
+    """
+    Place n agents uniformly in the ocean, outside the obstacles.
+
+    Args:
+        n (int): The number of agents.
+        width (float): The width of the ocean.
+        height (float): The height of the ocean.
+        obstacles (Sequence[Land], optional): The obstacles to avoid. Defaults to ().
+        rng (optional): The random generator. Defaults to numpy.random.
+
+    Returns:
+        np.ndarray: Array of shape (n, 2).
+    """
+    points = np.empty((n, 2))
+    todo = np.arange(n)
+    for _ in range(MAX_ATTEMPTS):
+        points[todo] = rng.random((len(todo), 2)) * (width, height)
+        todo = todo[~valid_positions(points[todo], width, height, obstacles)]
+        if not len(todo):
+            return points
+    raise ValueError(f"Cannot place {n} agents in the ocean")
+
+
+def shores(n: int, width: float, height: float, rng=np.random) -> np.ndarray:
+    """
+    Place n agents at random abscissas on the bottom or top edge of the ocean.
+
+    Args:
+        n (int): The number of agents.
+        width (float): The width of the ocean.
+        height (float): The height of the ocean.
+        rng (optional): The random generator. Defaults to numpy.random.
+
+    Returns:
+        np.ndarray: Array of shape (n, 2).
+    """
+    return np.stack([rng.random(n) * width, np.round(rng.random(n)) * height], axis=1)
+
+
+FISH_PLACEMENTS = ("grid", "poisson", "clustered", "schools")
+
+
+def place_fish(
+    strategy: str,
+    n: int,
+    spacing: float,
+    width: float,
+    height: float,
+    obstacles: Sequence = (),
+    n_schools: int = 1,
+    rng=np.random,
+) -> np.ndarray:
+    """
+    Place a population of fish with the given strategy.
+
+    Args:
+        strategy (str): One of FISH_PLACEMENTS.
+        n (int): The number of fish.
+        spacing (float): The distance between two fish. It is the spacing of the grids, the
+            minimal distance of the Poisson disk sampling, and the clusters spread so that
+            their density is close to the one of a grid.
+        width (float): The width of the ocean.
+        height (float): The height of the ocean.
+        obstacles (Sequence[Land], optional): The obstacles to avoid. Defaults to ().
+        n_schools (int, optional): The number of schools or clusters. Defaults to 1.
+        rng (optional): The random generator. Defaults to numpy.random.
+
+    Returns:
+        np.ndarray: Array of shape (n, 2).
+    """
+    if strategy == "grid":
+        return grid(n, spacing, width, height, obstacles, rng)
+    if strategy == "poisson":
+        return poisson_disk(n, spacing, width, height, obstacles, rng)
+    if strategy == "clustered":
+        spread = spacing * math.sqrt(n / n_schools) / 2
+        return clustered(n, n_schools, spread, width, height, obstacles, rng)
+    if strategy == "schools":
+        return schools(n, n_schools, spacing, width, height, obstacles, rng)
+    raise ValueError(
+        f"Unknown placement {strategy!r}, expected one of {', '.join(FISH_PLACEMENTS)}"
+    )
@@ -0,0 +1,101 @@
+"""
+Tolerance check of the single-precision storage mode.
+
+The trajectories of two runs sharing a seed diverge as soon as one rounding differs, so the
+float32 mode is not compared run by run. Instead, the nb_fish and nb_sharks curves are averaged
+over several seeds in each precision, and the largest gap between the mean curves, relative to
+the initial population, must stay below FLOAT32_TOLERANCE.
+
+With the random scheduler, the float32 copies only feed the mean heading of the fish, so the
+two modes stay close for a long time. The check is run with the staged scheduler, whose
+perception is computed from the float32 positions.
+"""
+
+from typing import Dict, Iterable
+
+import numpy as np
+
+from fishnsharks.model import Ocean
+
+CHECKED_SERIES = ("nb_fish", "nb_sharks")
+FLOAT32_TOLERANCE = 0.05
+
+
+def run_curves(
+    precision: str, seeds: Iterable[int], steps: int, **params
+) -> Dict[str, np.ndarray]:
+    """
+    Run the ocean once per seed and collect the checked series.
+
+    Args:
+        precision (str): The precision of the ocean, "float64" or "float32".
+        seeds (Iterable[int]): The seeds of the runs.
+        steps (int): The number of steps of each run. Runs that stop earlier keep their last
+            values until the end.
+        params: The other arguments of the Ocean constructor.
+
+    Returns:
+        Dict[str, np.ndarray]: For each series, an array of shape (number of seeds, steps + 1).
+    """
+    curves = {name: [] for name in CHECKED_SERIES}
+    for seed in seeds:
+        ocean = Ocean(precision=precision, seed=seed, **params)
+        for _ in range(steps):
+            if not ocean.running:
+                break
+            ocean.step()
+        for name in CHECKED_SERIES:
+            values = ocean.data_collector.model_vars[name][: steps + 1]
+            values = values + values[-1:] * (steps + 1 - len(values))
+            curves[name].append(values)
+    return {name: np.array(values, dtype=np.float64) for name, values in curves.items()}
+
+
+def compare_precisions(
+    seeds: Iterable[int] = range(20), steps: int = 200, **params
+) -> Dict[str, float]:
+    """
+    Compute the largest gap between the mean curves of the float64 and float32 modes.
+
+    Args:
+        seeds (Iterable[int], optional): The seeds of the runs. Defaults to range(20).
+        steps (int, optional): The number of steps of each run. Defaults to 200.
+        params: The other arguments of the Ocean constructor.
+
+    Returns:
+        Dict[str, float]: For each checked series, the largest gap between the mean curves
+            divided by the initial value of the series.
+    """
+    seeds = list(seeds)
+    reference = run_curves("float64", seeds, steps, **params)
+    single = run_curves("float32", seeds, steps, **params)
+    gaps = {}
+    for name in CHECKED_SERIES:
+        initial = max(reference[name][:, 0].mean(), 1)
+        gap = np.abs(reference[name].mean(axis=0) - single[name].mean(axis=0)).max()
+        gaps[name] = float(gap / initial)
+    return gaps
+
+
+def check_float32(tolerance: float = FLOAT32_TOLERANCE, **kwargs) -> bool:
+    """
+    Check that the float32 mode reproduces the population curves of the float64 mode.
+
+    Args:
+        tolerance (float, optional): The largest accepted relative gap. Defaults to
+            FLOAT32_TOLERANCE.
+        kwargs: The arguments of compare_precisions.
+
+    Returns:
+        bool: True if every checked series is within the tolerance.
+    """
+    return all(gap <= tolerance for gap in compare_precisions(**kwargs).values())
+
+
+if __name__ == "__main__":
+    params = dict(
+        n_fish=60, n_sharks=8, n_seagulls=3, fish_space=15, scheduler="staged"
+    )
+    for name, gap in compare_precisions(**params).items():
+        status = "ok" if gap <= FLOAT32_TOLERANCE else "FAILED"
+        print(f"{name}: relative gap {gap:.3f} ({status})")
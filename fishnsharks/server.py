@@ -0,0 +1,464 @@
+"""
+Web interface of the simulation.
+
+This module is the only one importing the visualization part of mesa, so that the simulation
+core can be used headless without paying for it.
+"""
+
+import argparse
+import json
+import os
+from collections import defaultdict
+
+import numpy as np
+import tornado.escape
+import tornado.ioloop
+import tornado.web
+import tornado.websocket
+from mesa.visualization.ModularVisualization import (
+    ModularServer,
+    SocketHandler,
+    UserSettableParameter,
+    VisualizationElement,
+)
+
+from fishnsharks.model import MAX_STEPS, OCEAN_HEIGHT, OCEAN_WIDTH, Ocean
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PORT = 5200
+DEFAULT_FPS = 5
+DEFAULT_LOD_THRESHOLD = 1000
+DEFAULT_DENSITY_CELL = 10
+
+
+def density_grid(points: np.ndarray, space, cell_size: float) -> np.ndarray:
+    """
+    Count the positions falling in each cell of a grid covering the space.
+
+    Args:
+        points (np.ndarray): Array of shape (N, 2) of positions.
+        space (ContinuousSpace): The space covered by the grid.
+        cell_size (float): The side of the cells.
+
+    Returns:
+        np.ndarray: Array of shape (rows, cols) of the counts, rows going up the y axis.
+    """
+    cols = max(int(np.ceil((space.x_max - space.x_min) / cell_size)), 1)
+    rows = max(int(np.ceil((space.y_max - space.y_min) / cell_size)), 1)
+    # The positions are inside the space, so truncating is flooring.
+    col = ((points[:, 0] - space.x_min) * (1 / cell_size)).astype(np.intp)
+    row = ((points[:, 1] - space.y_min) * (1 / cell_size)).astype(np.intp)
+    cells = np.clip(row, 0, rows - 1) * cols + np.clip(col, 0, cols - 1)
+    return np.bincount(cells, minlength=rows * cols).reshape(rows, cols)
+
+
+class ContinuousCanvas(VisualizationElement):
+    """
+    Canvas drawing the ocean.
+
+    Above lod_threshold fish, the fish are no longer drawn one by one: they are counted in a
+    density grid on the server and drawn as a heatmap, the sharks and seagulls being still
+    drawn individually on top. The size of a frame then no longer depends on the number of
+    fish.
+    """
+
+    local_includes = [
+        "js/simple_continuous_canvas.js",
+    ]
+
+    def __init__(
+        self,
+        canvas_height=OCEAN_HEIGHT,
+        canvas_width=OCEAN_WIDTH,
+        instantiate=True,
+        lod_threshold=None,
+        density_cell=DEFAULT_DENSITY_CELL,
+    ):
+        self.canvas_height = canvas_height
+        self.canvas_width = canvas_width
+        self.lod_threshold = lod_threshold
+        self.density_cell = density_cell
+        self.identifier = "space-canvas"
+        if instantiate:
+            new_element = "new Simple_Continuous_Module({}, {},'{}')".format(
+                self.canvas_width, self.canvas_height, self.identifier
+            )
+            self.js_code = "elements.push(" + new_element + ");"
+
+    def portrayal_method(self, obj):
+        return obj.portrayal_method()
+
+    def render(self, model) -> dict:
+        """
+        Render the environment on the canvas of the webpage.
+
+        Args:
+            model (_type_): _description_
+
+        Returns:
+            dict: _description_
+        """
+        representation = defaultdict(list)
+
+        # Print bloods
+        for obj in model.bloods:
+            portrayal = self.portrayal_method(obj)
+            if portrayal:
+                portrayal["x"] = (obj.x - model.space.x_min) / (
+                    model.space.x_max - model.space.x_min
+                )
+                portrayal["y"] = (obj.y - model.space.y_min) / (
+                    model.space.y_max - model.space.y_min
+                )
+            representation[portrayal["Layer"]].append(portrayal)
+
+        # Print obstacles
+        for obj in model.obstacles:
+            portrayal = self.portrayal_method(obj)
+            if portrayal:
+                portrayal["x"] = (obj.x - model.space.x_min) / (
+                    model.space.x_max - model.space.x_min
+                )
+                portrayal["y"] = (obj.y - model.space.y_min) / (
+                    model.space.y_max - model.space.y_min
+                )
+            representation[portrayal["Layer"]].append(portrayal)
+
+        # Print sands
+        for obj in model.sands:
+            portrayal = self.portrayal_method(obj)
+            if portrayal:
+                portrayal["x"] = (obj.pos[0] - model.space.x_min) / (
+                    model.space.x_max - model.space.x_min
+                )
+                portrayal["y"] = (obj.pos[1] - model.space.y_min) / (
+                    model.space.y_max - model.space.y_min
+                )
+            representation[portrayal["Layer"]].append(portrayal)
+
+        # Print agents, the fish as a density grid when they are too many
+        if self.lod_threshold is not None and len(model.list_fish) > self.lod_threshold:
+            counts = density_grid(model.fish_arrays.pos, model.space, self.density_cell)
+            representation[1].append(
+                {
+                    "Shape": "density",
+                    "Color": "0, 0, 255",
+                    "Layer": 1,
+                    "rows": counts.shape[0],
+                    "cols": counts.shape[1],
+                    "max": int(counts.max()),
+                    "counts": counts.ravel().tolist(),
+                }
+            )
+            agents = model.list_sharks + model.list_seagulls
+        else:
+            agents = model.schedule.agents
+        for obj in agents:
+            portrayal = self.portrayal_method(obj)
+            if portrayal:
+                portrayal["x"] = (obj.pos[0] - model.space.x_min) / (
+                    model.space.x_max - model.space.x_min
+                )
+                portrayal["y"] = (obj.pos[1] - model.space.y_min) / (
+                    model.space.y_max - model.space.y_min
+                )
+            representation[portrayal["Layer"]].append(portrayal)
+
+        return representation
+
+
+class HistoryChart(VisualizationElement):
+    """
+    Line chart of model-level series, redrawn from the model history at each step.
+
+    Unlike mesa's ChartModule, the browser does not accumulate the values: each frame carries
+    the history of the series, downsampled to at most max_points points, so that its size
+    does not grow with the length of the run.
+    """
+
+    package_includes = ["Chart.min.js"]
+    local_includes = ["js/history_chart.js"]
+
+    def __init__(
+        self,
+        series,
+        canvas_height=200,
+        canvas_width=500,
+        data_collector_name="data_collector",
+        max_points=500,
+    ):
+        self.series = series
+        self.canvas_height = canvas_height
+        self.canvas_width = canvas_width
+        self.data_collector_name = data_collector_name
+        self.max_points = max_points
+        new_element = "new HistoryChartModule({}, {}, {})".format(
+            json.dumps(series), canvas_width, canvas_height
+        )
+        self.js_code = "elements.push(" + new_element + ");"
+
+    def render(self, model) -> dict:
+        """
+        Render the history of the series.
+
+        Args:
+            model (Ocean): The model whose data collector is read.
+
+        Returns:
+            dict: The steps and, for each series, the values at these steps.
+        """
+        data_collector = getattr(model, self.data_collector_name)
+        values = []
+        steps = []
+        for s in self.series:
+            steps, series_values = data_collector.series(s["Label"])
+            if len(steps) > self.max_points:
+                kept = np.linspace(0, len(steps) - 1, self.max_points).astype(int)
+                steps, series_values = steps[kept], series_values[kept]
+            values.append(series_values.tolist())
+        return {"steps": np.asarray(steps).tolist(), "values": values}
+
+
+class BroadcastSocketHandler(SocketHandler):
+    """
+    Websocket handler of a viewer of a broadcast simulation.
+
+    The viewers do not step the model: the server steps it and pushes each frame to all of
+    them. The page sends a reset as soon as it receives the parameters of the model, so the
+    first reset of each viewer is ignored: a new viewer joins the running simulation instead
+    of restarting it. Later resets, from the reset button, and parameter changes affect
+    every viewer.
+    """
+
+    def open(self):
+        self.joined = False
+        super().open()
+        self.application.viewers.add(self)
+        if self.application.frame is not None:
+            self.write_message(self.application.frame)
+
+    def on_close(self):
+        self.application.viewers.discard(self)
+
+    def on_message(self, message):
+        msg = tornado.escape.json_decode(message)
+        if msg["type"] == "get_step":
+            # Frames are pushed by the server.
+            return
+        if msg["type"] == "reset" and not self.joined:
+            self.joined = True
+            self.write_message(self.application.frame or self.viz_state_message)
+            return
+        super().on_message(message)
+        if msg["type"] == "reset":
+            self.application.frame = None
+            self.application.ended = False
+
+
+class OceanServer(ModularServer):
+    """
+    Modular server serving the local JavaScript files from the package directory.
+
+    In broadcast mode, a single model is stepped by the server at a fixed rate while at least
+    one viewer is connected, and each frame is rendered and encoded once for all the viewers.
+    """
+
+    local_handler = (
+        r"/local/(.*)",
+        tornado.web.StaticFileHandler,
+        {"path": PACKAGE_DIR},
+    )
+    handlers = [
+        ModularServer.page_handler,
+        ModularServer.socket_handler,
+        ModularServer.static_handler,
+        local_handler,
+    ]
+
+    def __init__(
+        self, *args, broadcast: bool = False, fps: float = DEFAULT_FPS, **kwargs
+    ):
+        """
+        Create the server.
+
+        Args:
+            args: The arguments of ModularServer.
+            broadcast (bool, optional): Whether all the viewers watch the same simulation.
+                Defaults to False.
+            fps (float, optional): The number of steps per second in broadcast mode. Defaults
+                to DEFAULT_FPS.
+            kwargs: The keyword arguments of ModularServer.
+        """
+        self.broadcast = broadcast
+        self.fps = fps
+        self.viewers = set()
+        self.frame = None
+        self.ended = False
+        if broadcast:
+            self.handlers = [
+                self.page_handler,
+                (r"/ws", BroadcastSocketHandler),
+                self.static_handler,
+                self.local_handler,
+            ]
+        super().__init__(*args, **kwargs)
+
+    def broadcast_step(self):
+        """
+        Step the model and send the new frame to all the viewers.
+
+        Once the model has stopped, the end of the run is sent once, then nothing is sent
+        until the next reset.
+        """
+        if not self.viewers or self.ended:
+            return
+        if self.model.running:
+            self.model.step()
+            self.frame = tornado.escape.json_encode(
+                {"type": "viz_state", "data": self.render_model()}
+            )
+            message = self.frame
+        else:
+            self.ended = True
+            message = tornado.escape.json_encode({"type": "end"})
+        for viewer in list(self.viewers):
+            try:
+                viewer.write_message(message)
+            except tornado.websocket.WebSocketClosedError:
+                self.viewers.discard(viewer)
+
+    def launch(self, port=None, open_browser=True):
+        """Run the app, stepping the model periodically in broadcast mode."""
+        if self.broadcast:
+            tornado.ioloop.PeriodicCallback(
+                self.broadcast_step, 1000 / self.fps
+            ).start()
+        super().launch(port, open_browser)
+
+
+def build_server(
+    max_steps: int = MAX_STEPS,
+    history_size: int = None,
+    broadcast: bool = False,
+    fps: float = DEFAULT_FPS,
+    lod_threshold: int = DEFAULT_LOD_THRESHOLD,
+) -> OceanServer:
+    """
+    Create the web server displaying the ocean and the population charts.
+
+    Args:
+        max_steps (int, optional): The number of steps after which the runs stop, None for
+            unbounded runs. Defaults to MAX_STEPS.
+        history_size (int, optional): The history size of the models, see Ocean. Defaults
+            to None.
+        broadcast (bool, optional): Whether all the viewers watch the same simulation, stepped
+            by the server. Defaults to False.
+        fps (float, optional): The number of steps per second in broadcast mode. Defaults to
+            DEFAULT_FPS.
+        lod_threshold (int, optional): The number of fish above which they are drawn as a
+            density grid, None to always draw every fish. Defaults to DEFAULT_LOD_THRESHOLD.
+
+    Returns:
+        OceanServer: The server, ready to be launched.
+    """
+    chart = HistoryChart(
+        [
+            {"Label": "nb_fish", "Color": "Blue"},
+            {"Label": "nb_sharks", "Color": "Black"},
+            {"Label": "nb_seagulls", "Color": "Red"},
+        ],
+        data_collector_name="data_collector",
+    )
+
+    server = OceanServer(
+        Ocean,
+        [ContinuousCanvas(lod_threshold=lod_threshold), chart],
+        "Fish and Sharks",
+        {
+            "n_fish": UserSettableParameter("slider", "Nb of fish", 30, 5, 50, 5),
+            "n_sharks": UserSettableParameter("slider", "Nb of sharks", 5, 1, 15, 1),
+            "n_seagulls": UserSettableParameter("slider", "Nb of seagulls", 2, 1, 5, 1),
+            "fish_space": UserSettableParameter(
+                "slider", "Space between Fish", 20, 5, 50, 5
+            ),
+            "width": OCEAN_WIDTH,
+            "height": OCEAN_HEIGHT,
+            "max_steps": max_steps,
+            "history_size": history_size,
+            "following_rate": UserSettableParameter(
+                "slider", "Following rate", 0.8, 0.0, 1.0, 0.1
+            ),
+            "fish_vision": UserSettableParameter(
+                "slider", "Vision range - Fish", 40, 40, 80, 10
+            ),
+            "fish_speed": UserSettableParameter("slider", "Speed - Fish", 10, 5, 20, 1),
+            "shark_rest_time": UserSettableParameter(
+                "slider", "Rest Time - Shark", 5, 0, 20, 1
+            ),
+            "shark_slowing_factor": UserSettableParameter(
+                "slider", "Slowing Factor - Shark", 0.2, 0.0, 1.0, 0.1
+            ),
+            "shark_stranded_proba": UserSettableParameter(
+                "slider", "Stranding Probability - Shark", 0.05, 0.0, 1.0, 0.05
+            ),
+        },
+        broadcast=broadcast,
+        fps=fps,
+    )
+    server.port = DEFAULT_PORT
+    return server
+
+
+def main(argv=None):
+    """Launch the simulation in the browser."""
+    parser = argparse.ArgumentParser(description="Fish and Sharks simulation.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=MAX_STEPS,
+        help="Number of steps after which the run stops, 0 for an unbounded run.",
+    )
+    parser.add_argument(
+        "--history-size",
+        type=int,
+        default=None,
+        help="Number of samples kept at each resolution of the charts history.",
+    )
+    parser.add_argument(
+        "--broadcast",
+        action="store_true",
+        help="Run a single simulation on the server and show it to every viewer.",
+    )
+    parser.add_argument(
+        "--fps",
+        type=float,
+        default=DEFAULT_FPS,
+        help="Number of steps per second in broadcast mode.",
+    )
+    parser.add_argument(
+        "--lod-threshold",
+        type=int,
+        default=DEFAULT_LOD_THRESHOLD,
+        help="Number of fish above which they are drawn as a density grid, 0 to always "
+        "draw every fish.",
+    )
+    parser.add_argument(
+        "--no-browser",
+        action="store_true",
+        help="Do not open the web page automatically.",
+    )
+    args = parser.parse_args(argv)
+
+    server = build_server(
+        args.max_steps or None,
+        args.history_size,
+        args.broadcast,
+        args.fps,
+        args.lod_threshold or None,
+    )
+    server.launch(port=args.port, open_browser=not args.no_browser)
+
+
+if __name__ == "__main__":
+    main()
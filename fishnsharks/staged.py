@@ -0,0 +1,134 @@
+"""
+Two-phase activation of the agents.
+
+With mesa's RandomActivation, each agent perceives a world already changed by the agents
+activated before it during the same step. The SenseActActivation first computes what every
+agent perceives from the state of the ocean at the beginning of the step, in batch over the
+arrays of the populations, then lets the agents act on it:
+
+1. the sharks and the seagulls act. The fish they eat are only claimed;
+2. the claims are resolved: a fish claimed by several predators goes to the closest one,
+   then to the one with the lowest id, and the other ones are notified;
+3. the surviving fish act.
+
+The agents of a population do not interact while acting, so the result of a step does not
+depend on the order of the agents, which is the order of their ids.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+from mesa.time import BaseScheduler
+
+from fishnsharks.kernels import nearest
+from fishnsharks.utils import distanceL2_batch
+
+
+def _in_sight(model, points, vision, targets, inclusive):
+    """For each of the points, whether one of the targets is within its vision."""
+    seen = np.zeros(len(points), dtype=bool)
+    for target in targets:
+        dist = distanceL2_batch(points, target)
+        close = dist <= vision if inclusive else dist < vision
+        if model.visibility is not None:
+            close &= model.visibility.visible_batch(points, target[None])[:, 0]
+        seen |= close
+    return seen
+
+
+def sense_fish(model) -> List[Optional[str]]:
+    """
+    Compute the perception of every fish, see Fish.sense.
+
+    Args:
+        model (Ocean): The ocean at the beginning of the step.
+
+    Returns:
+        List[Optional[str]]: The percepts, in the order of model.list_fish.
+    """
+    fish = model.fish_arrays
+    vision = np.fromiter((agent.vision for agent in fish.agents), float, len(fish))
+    shark = _in_sight(model, fish.pos, vision, model.shark_arrays.pos, True)
+    seagull = _in_sight(model, fish.pos, vision, model.seagull_arrays.pos, True)
+    threats = np.full(len(fish), None, dtype=object)
+    threats[shark] = "SK"
+    threats[seagull] = "SG"
+    return threats.tolist()
+
+
+def sense_sharks(model) -> list:
+    """
+    Compute the perception of every shark, see Shark.sense.
+
+    Args:
+        model (Ocean): The ocean at the beginning of the step.
+
+    Returns:
+        list: The percepts, in the order of model.list_sharks.
+    """
+    fish_pos = model.fish_arrays.pos
+    blood_pos = model.blood_arrays.pos
+    sand_pos = np.array([sand.pos for sand in model.sands], dtype=float).reshape(-1, 2)
+    sand_r = np.array([sand.r for sand in model.sands], dtype=float)
+
+    percepts = []
+    for pos in model.shark_arrays.pos:
+        n_sands = int((distanceL2_batch(sand_pos, pos) <= sand_r).sum())
+        hidden = None
+        if model.visibility is not None and len(fish_pos):
+            hidden = ~model.visibility.visible_batch(pos[None], fish_pos)[0]
+        i, d_nearest_fish = nearest(model.kernels, fish_pos, pos, hidden)
+        nearest_fish = model.list_fish[i] if np.isfinite(d_nearest_fish) else None
+        blood_distances = distanceL2_batch(blood_pos, pos).tolist()
+        percepts.append((n_sands, nearest_fish, d_nearest_fish, blood_distances))
+    return percepts
+
+
+def sense_seagulls(model) -> list:
+    """
+    Compute the perception of every seagull, see Seagull.sense.
+
+    Only the first fish in sight is returned since it is the only one a seagull targets.
+
+    Args:
+        model (Ocean): The ocean at the beginning of the step.
+
+    Returns:
+        list: The percepts, in the order of model.list_seagulls.
+    """
+    fish_pos = model.fish_arrays.pos
+    percepts = []
+    for seagull, pos in zip(model.list_seagulls, model.seagull_arrays.pos):
+        in_sight = distanceL2_batch(fish_pos, pos) < seagull.vision
+        if model.visibility is not None and len(fish_pos):
+            in_sight &= model.visibility.visible_batch(pos[None], fish_pos)[0]
+        percepts.append(
+            [model.list_fish[int(np.argmax(in_sight))]] if in_sight.any() else []
+        )
+    return percepts
+
+
+class SenseActActivation(BaseScheduler):
+    """Scheduler activating the agents in a sense phase then an act phase."""
+
+    def step(self) -> None:
+        """Execute one step of all the agents, perception first."""
+        model = self.model
+        fish_percepts = sense_fish(model)
+        shark_percepts = sense_sharks(model)
+        seagull_percepts = sense_seagulls(model)
+
+        # The lists of agents are in the order of their ids.
+        model.start_claims()
+        for shark, percept in zip(model.list_sharks, shark_percepts):
+            shark.act(*percept)
+        for seagull, percept in zip(model.list_seagulls, seagull_percepts):
+            seagull.act(percept)
+        model.resolve_claims()
+
+        for fish, percept in zip(model.list_fish, fish_percepts):
+            if model.is_alive(fish):
+                fish.act(percept)
+
+        self.steps += 1
+        self.time += 1
@@ -0,0 +1,126 @@
+"""
+Array copies of the state of the populations of the ocean.
+
+The agents keep their own state as Python objects. At the end of each step, the ocean copies
+the fields read by its array paths into contiguous NumPy arrays, so that population-wide
+quantities can be computed without iterating over the agents in Python: the positions of
+every population and of the bloods, read by the staged scheduler and the density view, and
+the angles and speeds of the fish, read by mean_heading.
+
+The precision of the ocean only sets the dtype of these copies. They come in addition to the
+state of the agents, so the float32 mode does not reduce the memory of a run: it only halves
+the copies, and the data the array paths go through.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+from fishnsharks.kernels import NUMPY_KERNELS, Kernels
+from fishnsharks.kernels import mean_heading as kernels_mean_heading
+
+PRECISIONS = ("float64", "float32")
+
+
+def check_precision(precision: str) -> np.dtype:
+    """
+    Convert a precision name into the NumPy dtype used to store the states.
+
+    Parameters:
+        - precision (str): Either "float64" or "float32".
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(
+            f"Unknown precision {precision!r}, expected one of {', '.join(PRECISIONS)}"
+        )
+    return np.dtype(precision)
+
+
+class AgentArrays:
+    """
+    Positions, and optionally angles and speeds, of a population of agents, stored as arrays.
+
+    Row i of every array describes agents[i]. Without the kinematics, angle, speed and
+    max_speed are None.
+    """
+
+    __slots__ = ("agents", "pos", "angle", "speed", "max_speed")
+
+    def __init__(
+        self, agents: Sequence, dtype: np.dtype = np.float64, kinematics: bool = False
+    ):
+        """
+        Copy the state of the given agents into arrays.
+
+        Args:
+            agents (Sequence[Agent]): The agents. They must have a pos attribute, and angle,
+                speed and max_speed attributes if kinematics is True.
+            dtype (np.dtype, optional): The dtype of the arrays. Defaults to np.float64.
+            kinematics (bool, optional): Whether to copy the angles and speeds. Defaults to
+                False.
+        """
+        n = len(agents)
+        self.agents = agents
+        self.pos = np.fromiter(
+            (c for agent in agents for c in agent.pos), dtype, 2 * n
+        ).reshape(n, 2)
+        self.angle = self.speed = self.max_speed = None
+        if kinematics:
+            self.angle = np.fromiter((agent.angle for agent in agents), dtype, n)
+            self.speed = np.fromiter((agent.speed for agent in agents), dtype, n)
+            self.max_speed = np.fromiter(
+                (agent.max_speed for agent in agents), dtype, n
+            )
+
+    def __len__(self) -> int:
+        return len(self.agents)
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the arrays."""
+        arrays = (self.pos, self.angle, self.speed, self.max_speed)
+        return sum(array.nbytes for array in arrays if array is not None)
+
+
+class BloodArrays:
+    """Positions of the bloods, stored as an array."""
+
+    __slots__ = ("pos",)
+
+    def __init__(self, bloods: Sequence, dtype: np.dtype = np.float64):
+        """
+        Copy the positions of the given bloods into an array.
+
+        Args:
+            bloods (Sequence[Blood]): The bloods.
+            dtype (np.dtype, optional): The dtype of the array. Defaults to np.float64.
+        """
+        n = len(bloods)
+        self.pos = np.fromiter(
+            (c for blood in bloods for c in (blood.x, blood.y)), dtype, 2 * n
+        ).reshape(n, 2)
+
+    def __len__(self) -> int:
+        return len(self.pos)
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the array."""
+        return self.pos.nbytes
+
+
+def mean_heading(fish: AgentArrays, kernels: Kernels = NUMPY_KERNELS) -> float:
+    """
+    Compute the mean direction of a population, weighted by the speed ratio of each agent.
+
+    The accumulation is done in float64 whatever the storage precision.
+
+    Args:
+        fish (AgentArrays): The population, with its kinematics.
+        kernels (Kernels, optional): The backend computing the sums. Defaults to
+            NUMPY_KERNELS.
+
+    Returns:
+        float: The mean direction, or None if no agent is moving.
+    """
+    return kernels_mean_heading(kernels, fish.angle, fish.speed, fish.max_speed)
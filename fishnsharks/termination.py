@@ -0,0 +1,128 @@
+"""
+Termination criteria of the runs.
+
+At the end of each step, the ocean evaluates its criteria in order and stops at the first one
+met, recording its reason in Ocean.stop_reason. The criteria only look at quantities the ocean
+already maintains: the lists of agents, and for NoSharks the arrays of positions, which it
+scans once per seagull when no shark is left.
+
+A criterion may keep a state across the steps of a run. The ocean works on its own copies of
+the criteria it is given, so the same criteria can be passed to several runs.
+"""
+
+from typing import Optional
+
+from fishnsharks.utils import distanceL2_batch
+
+
+class Criterion:
+    """Base class of the termination criteria."""
+
+    __slots__ = ()
+    reason = None
+
+    def __call__(self, model) -> bool:
+        """Test whether the run should stop after the current step of the given ocean."""
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        args = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({args})"
+
+
+class MaxSteps(Criterion):
+    """Stop after a given number of steps."""
+
+    __slots__ = ("max_steps",)
+    reason = "max_steps"
+
+    def __init__(self, max_steps: int):
+        self.max_steps = max_steps
+
+    def __call__(self, model) -> bool:
+        return model.schedule.steps >= self.max_steps
+
+
+class Extinction(Criterion):
+    """Stop when every fish has been eaten."""
+
+    __slots__ = ()
+    reason = "extinction"
+
+    def __call__(self, model) -> bool:
+        return not model.list_fish
+
+
+class NoSharks(Criterion):
+    """
+    Stop when every shark is gone and the seagulls have nothing to do.
+
+    The seagulls never leave the ocean, so this criterion does not wait for them: it stops as
+    soon as no seagull is fishing or flying away and none has a fish in sight. A fish may still
+    swim within sight of a seagull later, so the few kills that could happen after this point
+    are not simulated.
+    """
+
+    __slots__ = ()
+    reason = "no_sharks"
+
+    def __call__(self, model) -> bool:
+        if model.list_sharks:
+            return False
+        fish_pos = model.fish_arrays.pos
+        for seagull, pos in zip(model.list_seagulls, model.seagull_arrays.pos):
+            if seagull.fishing or seagull.flying_away:
+                return False
+            # Same test as Seagull.sense, over the whole school at once.
+            in_sight = distanceL2_batch(fish_pos, pos) < seagull.vision
+            if model.visibility is not None and in_sight.any():
+                in_sight &= model.visibility.visible_batch(pos[None], fish_pos)[0]
+            if in_sight.any():
+                return False
+        return True
+
+
+class Stagnation(Criterion):
+    """
+    Stop when the populations have not changed for a given number of steps.
+
+    It covers the runs where the remaining predators are idle, for instance seagulls left
+    alone once the sharks have stranded and the fish have moved away from the shores.
+    """
+
+    __slots__ = ("window", "_counts", "_since")
+    reason = "stagnation"
+
+    def __init__(self, window: int = 200):
+        """
+        Standard constructor for the Stagnation class.
+
+        Args:
+            window (int, optional): The number of steps without any change of population
+                after which the run stops. Defaults to 200.
+        """
+        self.window = window
+        self._counts = None
+        self._since = 0
+
+    def __call__(self, model) -> bool:
+        counts = (
+            len(model.list_fish),
+            len(model.list_sharks),
+            len(model.list_seagulls),
+        )
+        if counts != self._counts:
+            self._counts = counts
+            self._since = model.schedule.steps
+        return model.schedule.steps - self._since >= self.window
+
+    def __repr__(self) -> str:
+        return f"Stagnation(window={self.window!r})"
+
+
+def first_met(criteria, model) -> Optional[str]:
+    """Return the reason of the first criterion met, or None if the run goes on."""
+    for criterion in criteria:
+        if criterion(model):
+            return criterion.reason
+    return None
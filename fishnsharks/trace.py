@@ -0,0 +1,395 @@
+"""
+Reference traces and differential checks of simulation engines.
+
+An engine is a callable building a model from a seed and the arguments of the Ocean
+constructor. The model must provide step(), close(), running, list_fish, list_sharks,
+list_seagulls and accept an event_log argument, like Ocean does. close() is called at the end
+of the run and must write the pending events to the log. The reference engine is the Ocean
+itself, with the agents of fishnsharks.agents.
+
+A trace records, for each step, the populations, the ids and positions of all the agents, and
+the predation events. Two engines are compared either run by run, by looking for the first
+step where their traces differ, or statistically over many seeds.
+"""
+
+import argparse
+import importlib
+import math
+import os
+import tempfile
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from fishnsharks.events import read_events
+from fishnsharks.model import Ocean
+
+POPULATIONS = ("nb_fish", "nb_sharks", "nb_seagulls")
+
+# Coefficient of the two-sample Kolmogorov-Smirnov critical value for a 5% risk.
+KS_COEFFICIENT = 1.358
+
+
+def reference_engine(seed: int, **params) -> Ocean:
+    """Build the reference model: the Ocean with its agent objects."""
+    return Ocean(seed=seed, **params)
+
+
+class Trace:
+    """Compact record of a run, step by step."""
+
+    def __init__(
+        self,
+        populations: np.ndarray,
+        ids: List[np.ndarray],
+        positions: List[np.ndarray],
+        events: Dict[str, np.ndarray],
+    ):
+        """
+        Standard constructor for the Trace class.
+
+        Args:
+            populations (np.ndarray): Array of shape (steps + 1, 3) with the number of fish,
+                sharks and seagulls after each step, the first row being the initial state.
+            ids (List[np.ndarray]): For each row of populations, the sorted ids of the agents.
+            positions (List[np.ndarray]): For each row of populations, the float32 positions
+                of the agents, in the order of ids. Empty if positions were not recorded.
+            events (Dict[str, np.ndarray]): The predation events, as read by read_events.
+        """
+        self.populations = populations
+        self.ids = ids
+        self.positions = positions
+        self.events = events
+
+    @property
+    def steps(self) -> int:
+        """Number of steps recorded."""
+        return len(self.populations) - 1
+
+    def save(self, path: str):
+        """
+        Save the trace in a compressed npz file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        offsets = np.cumsum([0] + [len(ids) for ids in self.ids])
+        np.savez_compressed(
+            path,
+            populations=self.populations,
+            offsets=offsets,
+            ids=np.concatenate(self.ids),
+            positions=(
+                np.concatenate(self.positions)
+                if self.positions
+                else np.zeros((0, 2), np.float32)
+            ),
+            **{"event_" + name: values for name, values in self.events.items()},
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "Trace":
+        """
+        Load a trace saved with Trace.save.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with np.load(path) as data:
+            offsets = data["offsets"]
+            ids = np.split(data["ids"], offsets[1:-1])
+            positions = (
+                np.split(data["positions"], offsets[1:-1])
+                if len(data["positions"])
+                else []
+            )
+            events = {
+                name[len("event_") :]: data[name]
+                for name in data.files
+                if name.startswith("event_")
+            }
+            return cls(data["populations"], ids, positions, events)
+
+
+def _snapshot(model, record_positions: bool):
+    agents = model.list_fish + model.list_sharks + model.list_seagulls
+    ids = np.fromiter((agent.unique_id for agent in agents), np.int64, len(agents))
+    order = np.argsort(ids, kind="stable")
+    positions = None
+    if record_positions:
+        positions = np.array([agent.pos for agent in agents], dtype=np.float32).reshape(
+            -1, 2
+        )[order]
+    populations = (
+        len(model.list_fish),
+        len(model.list_sharks),
+        len(model.list_seagulls),
+    )
+    return populations, ids[order], positions
+
+
+def record_trace(
+    engine: Callable = reference_engine,
+    seed: int = 0,
+    steps: int = 200,
+    record_positions: bool = True,
+    **params,
+) -> Trace:
+    """
+    Run an engine and record its trace.
+
+    Args:
+        engine (Callable, optional): The engine. Defaults to reference_engine.
+        seed (int, optional): The seed of the run. Defaults to 0.
+        steps (int, optional): The maximum number of steps. Defaults to 200.
+        record_positions (bool, optional): Whether to record the positions of the agents.
+            Defaults to True.
+        params: The other arguments of the Ocean constructor.
+
+    Returns:
+        Trace: The trace of the run.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = os.path.join(directory, "events.bin")
+        model = engine(seed, event_log=log_path, **params)
+        populations, ids, positions = [], [], []
+        for step in range(steps + 1):
+            if step:
+                if not model.running:
+                    break
+                model.step()
+            population, step_ids, step_positions = _snapshot(model, record_positions)
+            populations.append(population)
+            ids.append(step_ids)
+            if record_positions:
+                positions.append(step_positions)
+        model.close()
+        events = read_events(log_path)
+    return Trace(np.array(populations, dtype=np.int32), ids, positions, events)
+
+
+def first_divergence(
+    reference: Trace, candidate: Trace, atol: float = 1e-3
+) -> Optional[dict]:
+    """
+    Find the first step where two traces differ.
+
+    Args:
+        reference (Trace): The reference trace.
+        candidate (Trace): The trace to check.
+        atol (float, optional): The largest accepted difference between two positions.
+            Defaults to 1e-3.
+
+    Returns:
+        Optional[dict]: None if the traces match. Otherwise the step, the field that differs
+            ("length", "populations", "ids", "positions" or "events") and a description.
+    """
+    steps = min(reference.steps, candidate.steps)
+    ref_events = reference.events["step"]
+    cand_events = candidate.events["step"]
+    for step in range(steps + 1):
+        if not np.array_equal(reference.populations[step], candidate.populations[step]):
+            return {
+                "step": step,
+                "field": "populations",
+                "detail": "{} != {}".format(
+                    dict(zip(POPULATIONS, reference.populations[step].tolist())),
+                    dict(zip(POPULATIONS, candidate.populations[step].tolist())),
+                ),
+            }
+        if not np.array_equal(reference.ids[step], candidate.ids[step]):
+            missing = np.setdiff1d(reference.ids[step], candidate.ids[step])
+            extra = np.setdiff1d(candidate.ids[step], reference.ids[step])
+            return {
+                "step": step,
+                "field": "ids",
+                "detail": f"missing {missing.tolist()}, unexpected {extra.tolist()}",
+            }
+        if reference.positions and candidate.positions:
+            gaps = np.abs(reference.positions[step] - candidate.positions[step]).max(
+                axis=1, initial=0
+            )
+            if len(gaps) and gaps.max() > atol:
+                worst = int(np.argmax(gaps))
+                return {
+                    "step": step,
+                    "field": "positions",
+                    "detail": "agent {} is {:.6g} away from its reference position".format(
+                        int(reference.ids[step][worst]), float(gaps[worst])
+                    ),
+                }
+        ref_step = {
+            name: values[ref_events == step]
+            for name, values in reference.events.items()
+        }
+        cand_step = {
+            name: values[cand_events == step]
+            for name, values in candidate.events.items()
+        }
+        for name in ("type", "predator", "prey"):
+            if not np.array_equal(np.sort(ref_step[name]), np.sort(cand_step[name])):
+                return {
+                    "step": step,
+                    "field": "events",
+                    "detail": f"{name}: {ref_step[name].tolist()} != {cand_step[name].tolist()}",
+                }
+    if reference.steps != candidate.steps:
+        return {
+            "step": steps,
+            "field": "length",
+            "detail": f"{reference.steps} steps != {candidate.steps} steps",
+        }
+    return None
+
+
+def differential_check(
+    engine: Callable,
+    seed: int = 0,
+    steps: int = 200,
+    reference: Callable = reference_engine,
+    atol: float = 1e-3,
+    **params,
+) -> Optional[dict]:
+    """
+    Run an engine and the reference with the same seed and report their first divergence.
+
+    Args:
+        engine (Callable): The engine to check.
+        seed (int, optional): The seed of both runs. Defaults to 0.
+        steps (int, optional): The maximum number of steps. Defaults to 200.
+        reference (Callable, optional): The reference engine. Defaults to reference_engine.
+        atol (float, optional): The largest accepted difference between two positions.
+            Defaults to 1e-3.
+        params: The other arguments of the Ocean constructor.
+
+    Returns:
+        Optional[dict]: See first_divergence.
+    """
+    expected = record_trace(reference, seed, steps, **params)
+    actual = record_trace(engine, seed, steps, **params)
+    return first_divergence(expected, actual, atol)
+
+
+def _ks_statistic(a: np.ndarray, b: np.ndarray) -> float:
+    values = np.concatenate([a, b])
+    cdf_a = np.searchsorted(np.sort(a), values, side="right") / len(a)
+    cdf_b = np.searchsorted(np.sort(b), values, side="right") / len(b)
+    return float(np.abs(cdf_a - cdf_b).max())
+
+
+def compare_statistically(
+    engine: Callable,
+    seeds: Iterable[int] = range(30),
+    steps: int = 200,
+    reference: Callable = reference_engine,
+    **params,
+) -> Dict[str, dict]:
+    """
+    Compare the population curves of an engine and of the reference over many seeds.
+
+    For each population, the final values of both engines are compared with a two-sample
+    Kolmogorov-Smirnov test at a 5% risk, and the largest gap between the mean curves is
+    reported relative to the initial population.
+
+    Args:
+        engine (Callable): The engine to check.
+        seeds (Iterable[int], optional): The seeds of the runs. Defaults to range(30).
+        steps (int, optional): The maximum number of steps. Defaults to 200.
+        reference (Callable, optional): The reference engine. Defaults to reference_engine.
+        params: The other arguments of the Ocean constructor.
+
+    Returns:
+        Dict[str, dict]: For each population, the KS statistic, its critical value, the
+            relative gap between the mean curves and whether both engines are consistent.
+    """
+    seeds = list(seeds)
+    curves = []
+    for model_engine in (reference, engine):
+        runs = []
+        for seed in seeds:
+            trace = record_trace(
+                model_engine, seed, steps, record_positions=False, **params
+            )
+            populations = trace.populations
+            padding = np.repeat(populations[-1:], steps + 1 - len(populations), axis=0)
+            runs.append(np.concatenate([populations, padding]))
+        curves.append(np.array(runs, dtype=np.float64))
+
+    critical = KS_COEFFICIENT * math.sqrt(2 / len(seeds))
+    report = {}
+    for i, name in enumerate(POPULATIONS):
+        expected, actual = curves[0][:, :, i], curves[1][:, :, i]
+        statistic = _ks_statistic(expected[:, -1], actual[:, -1])
+        initial = max(expected[:, 0].mean(), 1)
+        gap = np.abs(expected.mean(axis=0) - actual.mean(axis=0)).max() / initial
+        report[name] = {
+            "ks_statistic": statistic,
+            "ks_critical": critical,
+            "mean_gap": float(gap),
+            "consistent": statistic <= critical,
+        }
+    return report
+
+
+def load_engine(path: str) -> Callable:
+    """
+    Import an engine given as "module:attribute".
+
+    Args:
+        path (str): The import path of the engine.
+    """
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def main(argv=None):
+    """Check an engine against the reference from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Compare a simulation engine with the reference Ocean."
+    )
+    parser.add_argument("engine", help='The engine to check, as "module:attribute".')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument(
+        "--seeds",
+        type=int,
+        default=0,
+        help="Compare statistically over this number of seeds instead of run by run.",
+    )
+    parser.add_argument("--n-fish", type=int, default=30)
+    parser.add_argument("--n-sharks", type=int, default=5)
+    parser.add_argument("--n-seagulls", type=int, default=2)
+    parser.add_argument("--fish-space", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    engine = load_engine(args.engine)
+    params = dict(
+        n_fish=args.n_fish,
+        n_sharks=args.n_sharks,
+        n_seagulls=args.n_seagulls,
+        fish_space=args.fish_space,
+    )
+    if args.seeds:
+        report = compare_statistically(
+            engine, range(args.seed, args.seed + args.seeds), args.steps, **params
+        )
+        for name, result in report.items():
+            print(
+                "{}: KS {:.3f} (critical {:.3f}), mean gap {:.3f} -> {}".format(
+                    name,
+                    result["ks_statistic"],
+                    result["ks_critical"],
+                    result["mean_gap"],
+                    "consistent" if result["consistent"] else "DIVERGENT",
+                )
+            )
+    else:
+        divergence = differential_check(engine, args.seed, args.steps, **params)
+        if divergence is None:
+            print("No divergence.")
+        else:
+            print("Diverges at step {step} ({field}): {detail}".format(**divergence))
+
+
+if __name__ == "__main__":
+    main()
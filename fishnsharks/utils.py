@@ -1,10 +1,48 @@
 import math
 import random
-from typing import Tuple
+import sys
+from typing import Sequence, Set, Tuple, Union
 
 import mesa
 import numpy as np
 
+from fishnsharks import kernels
+
+
+def obstacle_mask(
+    points: np.ndarray, obstacles: Sequence, d_safe: float = 0
+) -> np.ndarray:
+    """
+    Test which positions are on one of the given obstacles.
+
+    Parameters:
+        - points (np.ndarray): Array of shape (N, 2) of positions.
+        - obstacles (Sequence[Land]): The obstacles.
+        - d_safe (float, optional): Distance which extend the obstacle boundaries.
+    """
+    x, y = points[:, 0], points[:, 1]
+    mask = np.zeros(len(points), dtype=bool)
+    for obstacle in obstacles:
+        mask |= (
+            np.sqrt((x - obstacle.x) ** 2 + (y - obstacle.y) ** 2)
+            <= obstacle.r + d_safe
+        )
+    return mask
+
+
+def is_on_obstacle_batch(
+    points: np.ndarray, ocean: mesa.Model, d_safe: float = 0
+) -> np.ndarray:
+    """
+    Test which of the given positions are on an obstacle.
+
+    Parameters:
+        - points (np.ndarray): Array of shape (N, 2) of positions.
+        - ocean (mesa.Model): The ocean
+        - d_safe (float, optional): Distance which extend the obstacle boundaries.
+    """
+    return obstacle_mask(points, ocean.obstacles, d_safe)
+
 
 def is_on_obstacle(
     pos: Tuple[float, float], ocean: mesa.Model, d_safe: int = 0
@@ -25,6 +63,18 @@ def is_on_obstacle(
     return False
 
 
+def is_outside_batch(points: np.ndarray, ocean: mesa.Model) -> np.ndarray:
+    """
+    Test which of the given positions are outside the limits of the given ocean.
+
+    Parameters:
+        - points (np.ndarray): Array of shape (N, 2) of positions.
+        - ocean (mesa.Model): The ocean
+    """
+    x, y = points[:, 0], points[:, 1]
+    return (x <= 0) | (y <= 0) | (x >= ocean.width) | (y >= ocean.height)
+
+
 def is_outside(pos: Tuple[float, float], ocean: mesa.Model) -> bool:
     """
     Test whether the given pos is outside the limits of the given ocean.
@@ -39,6 +89,52 @@ def is_outside(pos: Tuple[float, float], ocean: mesa.Model) -> bool:
     return False
 
 
+def move_batch(
+    points: np.ndarray,
+    speed: Union[float, np.ndarray],
+    angle: Union[float, np.ndarray],
+    environment: mesa.Model,
+    max_retries: int = 10,
+) -> np.ndarray:
+    """
+    Compute the next positions of N agents given their speeds and angles.
+
+    The positions are clamped to the limits of the space. An agent whose next position is on
+    an obstacle tries again with half its speed, up to max_retries times, and stays where it
+    is if it still fails. The loop runs in the kernels of the backend of the environment. The
+    agents do not use it yet, they move one at a time with move.
+
+    Args:
+        points (np.ndarray): Array of shape (N, 2) of the initial positions.
+        speed (float or np.ndarray): The speeds of the agents.
+        angle (float or np.ndarray): The directions of the agents (0 <= float <= 2 pi).
+        environment (mesa.Model): The environment of the simulation in which the agents evolve.
+        max_retries (int, optional): The number of times the speed is halved. Defaults to 10.
+
+    Returns:
+        np.ndarray: Array of shape (N, 2) of the new positions.
+    """
+    n = len(points)
+    speed = np.broadcast_to(speed, (n,)).astype(points.dtype)
+    angle = np.broadcast_to(angle, (n,)).astype(np.float64)
+    bounds = np.array(
+        [
+            environment.space.x_min,
+            environment.space.y_min,
+            environment.space.x_max,
+            environment.space.y_max,
+        ],
+        dtype=points.dtype,
+    )
+    obstacles = np.array(
+        [(obstacle.x, obstacle.y, obstacle.r) for obstacle in environment.obstacles],
+        dtype=np.float64,
+    ).reshape(-1, 3)
+    return kernels.move(
+        environment.kernels, points, speed, angle, bounds, obstacles, max_retries
+    )
+
+
 def move(
     x: float,
     y: float,
@@ -79,6 +175,22 @@ def move(
     return new_x, new_y
 
 
+def direction_to_batch(targets: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    Compute the angles from N positions to N targets.
+
+    Args:
+        targets (np.ndarray): Array of shape (N, 2) of the positions of the targets.
+        points (np.ndarray): Array of shape (N, 2) of the positions of the objects.
+
+    Returns:
+        np.ndarray: The directions to the targets.
+    """
+    dy = targets[:, 1] - points[:, 1]
+    angle = np.arctan2(dy, targets[:, 0] - points[:, 0])
+    return np.where(dy < 0, -angle, angle)
+
+
 def direction_to(pos_target: Tuple[float, float], pos: Tuple[float, float]) -> float:
     """
     Compute the angle to a target.
@@ -100,6 +212,44 @@ def direction_to(pos_target: Tuple[float, float], pos: Tuple[float, float]) -> f
     return angle
 
 
+def go_to_batch(
+    targets: np.ndarray,
+    points: np.ndarray,
+    speed: Union[float, np.ndarray],
+    environment: mesa.Model,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute next positions and angles of N agents moving towards N targets.
+
+    An agent closer to its target than its speed reaches it and takes a random direction.
+
+    Parameters:
+        - targets (np.ndarray): Array of shape (N, 2) of the target positions.
+        - points (np.ndarray): Array of shape (N, 2) of the initial positions.
+        - speed (float or np.ndarray): The speeds given as the displacement per step.
+        - environment (mesa.Model): The bounded place in which the agents evolve.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The new positions and the new angles.
+    """
+    speed = np.broadcast_to(speed, (len(points),))
+    delta = targets - points
+    distance = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+    arrived = distance < speed
+    moving = ~arrived
+
+    angle = np.empty(len(points), dtype=np.result_type(points.dtype, float))
+    angle[arrived] = [2 * math.pi * random.random() for _ in range(arrived.sum())]
+    angle[moving] = np.arccos(np.clip(delta[moving, 0] / distance[moving], -1, 1))
+    angle[moving & (delta[:, 1] < 0)] *= -1
+
+    new_points = targets.astype(points.dtype, copy=True)
+    new_points[moving] = move_batch(
+        points[moving], speed[moving], angle[moving], environment
+    )
+    return new_points, angle
+
+
 def go_to(
     pos_target: Tuple[float, float],
     pos: Tuple[float, float],
@@ -118,14 +268,61 @@ def go_to(
     xt, yt = pos_target
     x, y = pos
 
-    if np.linalg.norm((x - xt, y - yt)) < speed:
+    distance = math.sqrt((x - xt) ** 2 + (y - yt) ** 2)
+    if distance < speed:
         return (xt, yt), 2 * math.pi * random.random()
     else:
-        angle = math.acos((xt - x) / np.linalg.norm((x - xt, y - yt)))
+        angle = math.acos((xt - x) / distance)
         if yt < y:
             angle = -angle
         return move(x, y, speed, angle, environment), angle
 
 
+def distanceL2_batch(points1: np.ndarray, points2: np.ndarray) -> np.ndarray:
+    """
+    Compute the distances between two sets of positions.
+
+    The arrays are broadcast against each other, the last axis holding the coordinates.
+    """
+    dx = points2[..., 0] - points1[..., 0]
+    dy = points2[..., 1] - points1[..., 1]
+    return np.sqrt(dx**2 + dy**2)
+
+
 def distanceL2(pos1, pos2):
     return np.sqrt((pos2[0] - pos1[0]) ** 2 + (pos2[1] - pos1[1]) ** 2)
+
+
+def slots_sizeof(obj: object, seen: Set[int]) -> int:
+    """
+    Compute the memory footprint in bytes of a slotted object and of the values it holds.
+
+    Parameters:
+        - obj (object): An object, ideally with all its attributes in __slots__.
+        - seen (set[int]): Ids of the objects already counted. It is updated in place so
+          that values shared between several objects are only counted once.
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    values = [
+        getattr(obj, name, None)
+        for cls in type(obj).__mro__
+        for name in getattr(cls, "__slots__", ())
+    ]
+    # Attributes of a class without __slots__ in the hierarchy live in a __dict__.
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+        values.extend(obj.__dict__.values())
+    for value in values:
+        if value is None or id(value) in seen:
+            continue
+        seen.add(id(value))
+        size += sys.getsizeof(value)
+        if isinstance(value, tuple):
+            for item in value:
+                if id(item) not in seen:
+                    seen.add(id(item))
+                    size += sys.getsizeof(item)
+    return size
@@ -0,0 +1,163 @@
+"""
+Line of sight through the obstacles of the ocean.
+
+The ocean is divided in square cells and the visibility between the centers of every pair of
+cells is computed once per layout of obstacles. Testing whether an agent can see another one
+is then a lookup in this table, whatever the number of obstacles. The table is stored with one
+bit per pair of cells, and its size is bounded by MAX_TABLE_BYTES.
+"""
+
+import math
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from fishnsharks.env import Land
+
+# Number of cells whose visibility towards all the other cells is computed at once.
+CHUNK_SIZE = 64
+
+# Largest size of a visibility table, in bytes.
+MAX_TABLE_BYTES = 64 * 2**20
+
+
+def segments_cross_circle(
+    starts: np.ndarray, ends: np.ndarray, center: Tuple[float, float], r: float
+) -> np.ndarray:
+    """
+    Test which segments pass strictly closer than r to the given center.
+
+    Args:
+        starts (np.ndarray): Array of shape (..., 2) of the first ends of the segments.
+        ends (np.ndarray): Array of shape (..., 2) of the second ends of the segments.
+        center (Tuple[float, float]): The center of the circle.
+        r (float): The radius of the circle.
+
+    Returns:
+        np.ndarray: Boolean array of shape (...).
+    """
+    direction = ends - starts
+    to_center = np.asarray(center) - starts
+    length2 = (direction**2).sum(axis=-1)
+    t = np.clip(
+        (to_center * direction).sum(axis=-1) / np.where(length2 > 0, length2, 1), 0, 1
+    )
+    closest = starts + t[..., None] * direction
+    return ((closest - center) ** 2).sum(axis=-1) < r**2
+
+
+class VisibilityMap:
+    """
+    Cell to cell visibility table of the ocean.
+
+    Row a of the table holds the visibility from cell a towards every cell, packed with
+    np.packbits: cell b is bit 7 - b % 8 of byte b // 8.
+    """
+
+    __slots__ = ("cell_size", "cols", "rows", "table")
+
+    def __init__(
+        self, width: float, height: float, obstacles: Sequence, cell_size: float = 20
+    ):
+        """
+        Compute the visibility table.
+
+        Two cells see each other if the segment between their centers goes less than half a
+        cell deep into every obstacle, so that agents standing on the shore are not hidden by
+        the obstacle they stand next to.
+
+        Args:
+            width (float): The width of the ocean.
+            height (float): The height of the ocean.
+            obstacles (Sequence[Land]): The obstacles blocking the view.
+            cell_size (float, optional): The side of the cells. Defaults to 20.
+
+        Raises:
+            ValueError: If the table would take more than MAX_TABLE_BYTES.
+        """
+        self.cell_size = cell_size
+        self.cols = max(math.ceil(width / cell_size), 1)
+        self.rows = max(math.ceil(height / cell_size), 1)
+        ix, iy = np.meshgrid(np.arange(self.cols), np.arange(self.rows), indexing="ij")
+        centers = (np.stack([ix, iy], axis=-1).reshape(-1, 2) + 0.5) * cell_size
+
+        n = len(centers)
+        nbytes = n * ((n + 7) // 8)
+        if nbytes > MAX_TABLE_BYTES:
+            raise ValueError(
+                f"A visibility table of {n} cells of {cell_size} would take {nbytes} bytes, "
+                f"more than {MAX_TABLE_BYTES}: use larger cells"
+            )
+        self.table = np.empty((n, (n + 7) // 8), dtype=np.uint8)
+        for start in range(0, n, CHUNK_SIZE):
+            starts = centers[start : start + CHUNK_SIZE, None, :]
+            visible = np.ones((len(starts), n), dtype=bool)
+            for obstacle in obstacles:
+                r = obstacle.r - cell_size / 2
+                if r <= 0:
+                    continue
+                visible &= ~segments_cross_circle(
+                    starts, centers[None, :, :], (obstacle.x, obstacle.y), r
+                )
+            self.table[start : start + CHUNK_SIZE] = np.packbits(visible, axis=1)
+
+    def cell(self, pos: Tuple[float, float]) -> int:
+        """Index of the cell containing a position."""
+        i = min(max(int(pos[0] / self.cell_size), 0), self.cols - 1)
+        j = min(max(int(pos[1] / self.cell_size), 0), self.rows - 1)
+        return i * self.rows + j
+
+    def cells(self, points: np.ndarray) -> np.ndarray:
+        """Indices of the cells containing an array of shape (N, 2) of positions."""
+        i = np.clip((points[:, 0] / self.cell_size).astype(np.intp), 0, self.cols - 1)
+        j = np.clip((points[:, 1] / self.cell_size).astype(np.intp), 0, self.rows - 1)
+        return i * self.rows + j
+
+    def visible(self, pos1: Tuple[float, float], pos2: Tuple[float, float]) -> bool:
+        """Test whether two positions see each other."""
+        b = self.cell(pos2)
+        return bool(self.table[self.cell(pos1), b >> 3] >> (7 - (b & 7)) & 1)
+
+    def visible_batch(self, points1: np.ndarray, points2: np.ndarray) -> np.ndarray:
+        """
+        Test which positions see each other.
+
+        Args:
+            points1 (np.ndarray): Array of shape (N, 2) of positions.
+            points2 (np.ndarray): Array of shape (M, 2) of positions.
+
+        Returns:
+            np.ndarray: Boolean array of shape (N, M).
+        """
+        b = self.cells(points2)
+        rows = self.table[self.cells(points1)]
+        return (rows[:, b >> 3] >> (7 - (b & 7)).astype(np.uint8) & 1).astype(bool)
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the table."""
+        return self.table.nbytes
+
+
+@lru_cache(maxsize=8)
+def _cached_map(width, height, obstacles, cell_size) -> VisibilityMap:
+    return VisibilityMap(
+        width, height, [Land(*obstacle) for obstacle in obstacles], cell_size
+    )
+
+
+def visibility_map(
+    width: float, height: float, obstacles: Sequence, cell_size: float = 20
+) -> VisibilityMap:
+    """
+    Get the visibility table of a layout, computing it only once per layout.
+
+    Args:
+        width (float): The width of the ocean.
+        height (float): The height of the ocean.
+        obstacles (Sequence[Land]): The obstacles blocking the view.
+        cell_size (float, optional): The side of the cells. Defaults to 20.
+    """
+    layout = tuple((obstacle.x, obstacle.y, obstacle.r) for obstacle in obstacles)
+    return _cached_map(width, height, layout, cell_size)
@@ -0,0 +1,28 @@
+from fishnsharks.model import Ocean
+from fishnsharks.utils import slots_sizeof
+
+
+class Unslotted:
+    def __init__(self):
+        self.values = list(range(100))
+
+
+def test_agents_have_no_instance_dict():
+    ocean = Ocean(10, 2, 2, 20, seed=0)
+    for agent in ocean.schedule.agents:
+        assert not hasattr(agent, "__dict__")
+
+
+def test_slots_sizeof_counts_instance_dict():
+    obj = Unslotted()
+    assert slots_sizeof(obj, set()) > 8 * 100
+
+
+def test_memory_report_counts_every_agent():
+    report = Ocean(10, 2, 2, 20, seed=0).memory_report()
+    assert {name: entry["count"] for name, entry in report.items()} == {
+        "Fish": 10,
+        "Shark": 2,
+        "Seagull": 2,
+    }
+    assert all(entry["bytes_per_agent"] > 0 for entry in report.values())
@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+
+from fishnsharks.cache import STEP_KEY, ResultCache, _compact
+
+
+def test_compact_keeps_large_integral_floats_exact():
+    values = np.array([5001.0, 5000.0, 70000.0])
+    compact = _compact(values)
+    assert compact.dtype.kind == "i"
+    np.testing.assert_array_equal(compact, values)
+
+
+def test_compact_keeps_fractional_floats():
+    values = np.array([0.5, 2049.25])
+    assert _compact(values).dtype == values.dtype
+
+
+def test_run_round_trip(tmp_path):
+    params = dict(n_fish=5001, n_sharks=0, n_seagulls=0, fish_space=1, history_size=100)
+    cache = ResultCache(tmp_path)
+    computed = cache.run(0, 1, **params)
+    read = cache.run(0, 1, **params)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    np.testing.assert_array_equal(computed["nb_fish"], [5001, 5001])
+    assert computed.keys() == read.keys()
+    for name in computed:
+        np.testing.assert_array_equal(read[name], computed[name])
+        assert read[name].dtype == computed[name].dtype
+
+
+def test_sweep_only_runs_new_cells(tmp_path):
+    params = dict(n_fish=10, n_seagulls=1, fish_space=20)
+    cache = ResultCache(tmp_path)
+    list(cache.sweep({"n_sharks": [1, 2]}, range(2), 5, **params))
+    results = list(cache.sweep({"n_sharks": [1, 2, 3]}, range(2), 5, **params))
+
+    assert (cache.misses, cache.hits) == (6, 4)
+    assert [(cell["n_sharks"], seed) for cell, seed, _ in results] == [
+        (1, 0),
+        (1, 1),
+        (2, 0),
+        (2, 1),
+        (3, 0),
+        (3, 1),
+    ]
+    assert all(len(series[STEP_KEY]) == 6 for _, _, series in results)
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path)
+    for i, key in enumerate("abc"):
+        cache.put(key, {"nb_fish": np.arange(1000.0)})
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    cache.get("a")
+    cache.max_bytes = 2 * cache.nbytes() // 3
+    cache.evict()
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from fishnsharks import Ocean
+from fishnsharks.events import (
+    MAGIC,
+    NO_AGENT,
+    SEAGULL_KILL,
+    SHARK_KILL,
+    STRANDING,
+    EventLog,
+    read_events,
+)
+
+
+def test_round_trip_across_buffer_flushes(tmp_path):
+    path = tmp_path / "events.bin"
+    with EventLog(path, buffer_size=4) as log:
+        for i in range(10):
+            log.record(i, SHARK_KILL, 100 + i, 200 + i, i / 2, -i)
+        # Two full buffers are on disk, the last two events are still buffered.
+        assert path.stat().st_size == len(MAGIC) + 8 * log._buffer.itemsize
+
+    events = read_events(path)
+    np.testing.assert_array_equal(events["step"], np.arange(10))
+    np.testing.assert_array_equal(events["type"], [SHARK_KILL] * 10)
+    np.testing.assert_array_equal(events["predator"], 100 + np.arange(10))
+    np.testing.assert_array_equal(events["prey"], 200 + np.arange(10))
+    np.testing.assert_array_equal(events["x"], np.arange(10) / 2)
+    np.testing.assert_array_equal(events["y"], -np.arange(10))
+
+
+def test_reopening_appends_without_a_second_header(tmp_path):
+    path = tmp_path / "events.bin"
+    with EventLog(path) as log:
+        log.record(1, SEAGULL_KILL, 7, 3, 10.0, 20.0)
+    with EventLog(path, append=True) as log:
+        log.record(2, STRANDING, NO_AGENT, 5, 30.0, 40.0)
+
+    events = read_events(path)
+    np.testing.assert_array_equal(events["step"], [1, 2])
+    np.testing.assert_array_equal(events["type"], [SEAGULL_KILL, STRANDING])
+    np.testing.assert_array_equal(events["predator"], [7, NO_AGENT])
+
+
+def test_reopening_overwrites_by_default(tmp_path):
+    path = tmp_path / "events.bin"
+    with EventLog(path) as log:
+        log.record(1, SEAGULL_KILL, 7, 3, 10.0, 20.0)
+    with EventLog(path) as log:
+        log.record(2, STRANDING, NO_AGENT, 5, 30.0, 40.0)
+
+    np.testing.assert_array_equal(read_events(path)["step"], [2])
+
+
+def test_refuses_to_append_to_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a log")
+    with pytest.raises(ValueError):
+        EventLog(path, append=True)
+    assert path.read_bytes() == b"not a log"
+
+
+def test_ocean_logs_events_at_the_step_of_the_history(tmp_path):
+    path = tmp_path / "events.bin"
+    ocean = Ocean(30, 5, 2, 20, seed=0, event_log=path, max_steps=100)
+    while ocean.running:
+        ocean.step()
+    ocean.close()
+
+    events = read_events(path)
+    assert len(events["step"])
+    steps, nb_fish = ocean.data_collector.series("nb_fish")
+    fish_deaths = np.zeros(steps[-1] + 1, dtype=int)
+    eaten = np.isin(events["type"], [SHARK_KILL, SEAGULL_KILL])
+    np.add.at(fish_deaths, events["step"][eaten], 1)
+    np.testing.assert_array_equal(-np.diff(nb_fish), fish_deaths[steps[1:]])
+
+
+def test_empty_log_reads_back_empty(tmp_path):
+    path = tmp_path / "events.bin"
+    EventLog(path).close()
+    assert all(len(values) == 0 for values in read_events(path).values())
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a log")
+    with pytest.raises(ValueError):
+        read_events(path)
@@ -0,0 +1,60 @@
+import numpy as np
+
+from fishnsharks.history import (
+    FullHistory,
+    HistoryCollector,
+    MultiResolutionHistory,
+    RingBuffer,
+)
+
+
+def test_ring_buffer_wraps_around():
+    buffer = RingBuffer(4)
+    for step in range(10):
+        buffer.append(step, 10.0 * step)
+    steps, values = buffer.arrays()
+    np.testing.assert_array_equal(steps, [6, 7, 8, 9])
+    np.testing.assert_array_equal(values, [60, 70, 80, 90])
+
+
+def test_ring_buffer_before_wrapping():
+    buffer = RingBuffer(4)
+    buffer.append(0, 1.0)
+    buffer.append(1, 2.0)
+    steps, values = buffer.arrays()
+    np.testing.assert_array_equal(steps, [0, 1])
+    np.testing.assert_array_equal(values, [1, 2])
+
+
+def test_multi_resolution_is_increasing_and_bounded():
+    capacity = 20
+    history = MultiResolutionHistory(capacity, (1, 10, 100))
+    for step in range(5000):
+        history.append(step, float(step))
+        if step % 97 == 0 or step == 4999:
+            steps, values = history.arrays()
+            assert len(steps) == len(values) <= 3 * capacity
+            assert np.all(np.diff(steps) > 0)
+    # The newest samples are kept at full resolution.
+    np.testing.assert_array_equal(steps[-capacity:], np.arange(4980, 5000))
+    assert steps[0] < 4980 - 10 * (capacity - 1)
+
+
+def test_multi_resolution_averages_buckets():
+    history = MultiResolutionHistory(3, (1, 10))
+    for step in range(30):
+        history.append(step, float(step))
+    steps, values = history.arrays()
+    np.testing.assert_array_equal(steps, [9, 19, 27, 28, 29])
+    np.testing.assert_array_equal(values, [4.5, 14.5, 27, 28, 29])
+
+
+def test_collector_without_capacity_keeps_every_sample():
+    collector = HistoryCollector({"x": lambda model: model.value})
+    assert isinstance(collector.histories["x"], FullHistory)
+    model = type("Model", (), {})()
+    model.schedule = type("Schedule", (), {})()
+    for step in range(5):
+        model.schedule.steps, model.value = step, step * 2
+        collector.collect(model)
+    assert collector.model_vars == {"x": [0, 2, 4, 6, 8]}
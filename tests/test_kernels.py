@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from fishnsharks.kernels import get_kernels, mean_heading, move, nearest
+
+
+def test_import_does_not_load_numba():
+    code = "import sys, fishnsharks; fishnsharks.Ocean; print('numba' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_numpy_nearest_ignores_hidden_points():
+    kernels = get_kernels("numpy")
+    points = np.array([[0.0, 0.0], [3.0, 4.0], [10.0, 0.0]])
+    assert nearest(kernels, points, np.array([0.0, 0.0]), points[:, 0] == 0) == (1, 5)
+    assert nearest(kernels, points, np.zeros(2), np.ones(3, dtype=bool)) == (-1, np.inf)
+
+
+def test_backends_agree():
+    pytest.importorskip("numba")
+    numpy_kernels, numba_kernels = get_kernels("numpy"), get_kernels("numba")
+    assert numba_kernels.name == "numba"
+
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0, 600, (1000, 2))
+    angle = rng.uniform(0, 2 * np.pi, 1000)
+    speed = rng.uniform(0, 5, 1000)
+    max_speed = np.full(1000, 5.0)
+    hidden = rng.random(1000) < 0.5
+    bounds = np.array([0, 0, 600, 600], dtype=float)
+    obstacles = np.array([[0, 0, 120], [300, 300, 50]], dtype=float)
+
+    assert mean_heading(numpy_kernels, angle, speed, max_speed) == pytest.approx(
+        mean_heading(numba_kernels, angle, speed, max_speed)
+    )
+    target = np.array([300.0, 200.0])
+    assert nearest(numpy_kernels, points, target, hidden) == pytest.approx(
+        nearest(numba_kernels, points, target, hidden)
+    )
+    np.testing.assert_allclose(
+        move(numpy_kernels, points, speed, angle, bounds, obstacles),
+        move(numba_kernels, points, speed, angle, bounds, obstacles),
+    )
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from fishnsharks.env import Land
+from fishnsharks.model import Ocean
+from fishnsharks.placement import (
+    FISH_PLACEMENTS,
+    place_fish,
+    shores,
+    uniform,
+    valid_positions,
+)
+
+WIDTH = HEIGHT = 600
+OBSTACLES = [Land(0, 0, 120)]
+
+
+def min_distance(points):
+    gaps = points[:, None] - points[None]
+    distances = np.sqrt((gaps**2).sum(axis=-1))
+    distances[np.diag_indices(len(points))] = np.inf
+    return distances.min()
+
+
+@pytest.mark.parametrize("strategy", FISH_PLACEMENTS)
+@pytest.mark.parametrize("n", [0, 1, 7, 2000])
+def test_places_exactly_n_fish_inside_the_ocean(strategy, n):
+    rng = np.random.default_rng(n)
+    points = place_fish(strategy, n, 5, WIDTH, HEIGHT, OBSTACLES, n_schools=3, rng=rng)
+    assert points.shape == (n, 2)
+    assert valid_positions(points, WIDTH, HEIGHT, OBSTACLES).all()
+    if strategy in ("grid", "schools", "poisson") and n > 1:
+        assert min_distance(points) >= 5 - 1e-9
+
+
+def test_grid_keeps_the_spacing_when_n_is_not_a_square():
+    points = place_fish("grid", 7, 10, WIDTH, HEIGHT, OBSTACLES, rng=np.random)
+    assert len(np.unique(points.round(6), axis=0)) == 7
+    assert min_distance(points) == pytest.approx(10)
+
+
+@pytest.mark.parametrize("strategy", ["grid", "poisson"])
+def test_raises_when_the_fish_do_not_fit(strategy):
+    with pytest.raises(ValueError):
+        place_fish(strategy, 2000, 20, WIDTH, HEIGHT, OBSTACLES)
+
+
+def test_ocean_raises_when_the_fish_do_not_fit():
+    with pytest.raises(ValueError):
+        Ocean(2000, 1, 1, fish_space=20, seed=0)
+
+
+def test_unknown_placement():
+    with pytest.raises(ValueError):
+        place_fish("spiral", 10, 5, WIDTH, HEIGHT)
+
+
+def test_uniform_and_shores():
+    points = uniform(500, WIDTH, HEIGHT, OBSTACLES)
+    assert points.shape == (500, 2)
+    assert valid_positions(points, WIDTH, HEIGHT, OBSTACLES).all()
+    points = shores(50, WIDTH, HEIGHT)
+    assert set(points[:, 1]) <= {0, HEIGHT}
+
+
+def test_grid_falls_back_to_an_ocean_wide_grid_around_the_land():
+    # A 55 x 55 block cannot avoid the Land in the corner.
+    points = place_fish("grid", 3000, 10, WIDTH, HEIGHT, OBSTACLES)
+    assert points.shape == (3000, 2)
+    assert valid_positions(points, WIDTH, HEIGHT, OBSTACLES).all()
+    assert min_distance(points) == pytest.approx(10)
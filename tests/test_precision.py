@@ -0,0 +1,20 @@
+from fishnsharks import Ocean
+from fishnsharks.precision import FLOAT32_TOLERANCE, compare_precisions
+
+PARAMS = dict(n_fish=60, n_sharks=8, n_seagulls=3, fish_space=15, scheduler="staged")
+
+
+def test_float32_curves_within_tolerance():
+    gaps = compare_precisions(seeds=range(4), steps=250, **PARAMS)
+    # The two modes must actually diverge for the check to mean anything.
+    assert any(gap > 0 for gap in gaps.values()), gaps
+    assert all(gap <= FLOAT32_TOLERANCE for gap in gaps.values()), gaps
+
+
+def test_float32_halves_the_arrays():
+    single = Ocean(**PARAMS, precision="float32", seed=0).memory_report()
+    double = Ocean(**PARAMS, precision="float64", seed=0).memory_report()
+    for name, entry in double.items():
+        assert entry["array_bytes"] > 0
+        assert single[name]["array_bytes"] * 2 == entry["array_bytes"]
+        assert single[name]["bytes"] == entry["bytes"]
@@ -0,0 +1,115 @@
+import json
+
+import numpy as np
+import tornado.testing
+import tornado.websocket
+from mesa.space import ContinuousSpace
+
+from fishnsharks.model import Ocean
+from fishnsharks.server import ContinuousCanvas, build_server, density_grid
+
+
+class BroadcastTest(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        self.server = build_server(broadcast=True)
+        return self.server
+
+    async def join(self):
+        """Connect a viewer and send the reset the page sends on connection."""
+        frames = 1 if self.server.frame is None else 2
+        client = await tornado.websocket.websocket_connect(
+            self.get_url("/ws").replace("http", "ws")
+        )
+        assert json.loads(await client.read_message())["type"] == "model_params"
+        client.write_message(json.dumps({"type": "reset"}))
+        # The current frame sent on connection, if any, then the answer to the reset.
+        for _ in range(frames):
+            assert json.loads(await client.read_message())["type"] == "viz_state"
+        return client
+
+    @tornado.testing.gen_test
+    async def test_new_viewer_does_not_restart_the_simulation(self):
+        first = await self.join()
+        for _ in range(30):
+            self.server.broadcast_step()
+        model = self.server.model
+        assert model.schedule.steps == 30
+
+        second = await self.join()
+        assert self.server.model is model
+        assert model.schedule.steps == 30
+
+        self.server.broadcast_step()
+        assert model.schedule.steps == 31
+        for client in (first, second):
+            client.close()
+
+    @tornado.testing.gen_test
+    async def test_reset_button_restarts_the_simulation(self):
+        client = await self.join()
+        for _ in range(5):
+            self.server.broadcast_step()
+        client.write_message(json.dumps({"type": "reset"}))
+        # The five broadcast frames, then the answer to the reset.
+        for _ in range(6):
+            while json.loads(await client.read_message())["type"] != "viz_state":
+                pass
+        assert self.server.model.schedule.steps == 0
+        client.close()
+
+    @tornado.testing.gen_test
+    async def test_end_is_sent_once_per_run(self):
+        client = await self.join()
+        self.server.model.running = False
+        for _ in range(3):
+            self.server.broadcast_step()
+        client.write_message(json.dumps({"type": "reset"}))
+        # A single end, then the answer to the reset.
+        assert json.loads(await client.read_message())["type"] == "end"
+        assert json.loads(await client.read_message())["type"] == "viz_state"
+
+        self.server.model.running = False
+        self.server.broadcast_step()
+        assert json.loads(await client.read_message())["type"] == "end"
+        client.close()
+
+
+def test_density_grid_counts_every_point():
+    space = ContinuousSpace(600, 600, False)
+    points = np.random.default_rng(0).uniform(0, 600, (5000, 2))
+    counts = density_grid(points, space, 10)
+    assert counts.shape == (60, 60)
+    assert counts.sum() == 5000
+
+
+def test_density_grid_puts_the_edges_in_the_last_cells():
+    space = ContinuousSpace(600, 400, False)
+    points = np.array([[600.0, 400.0], [0.0, 400.0], [600.0, 0.0], [0.0, 0.0]])
+    counts = density_grid(points, space, 30)
+    assert counts.shape == (14, 20)
+    assert counts[-1, -1] == counts[-1, 0] == counts[0, -1] == counts[0, 0] == 1
+    assert counts.sum() == 4
+
+
+def render(n_fish, lod_threshold):
+    ocean = Ocean(n_fish, 3, 2, 20, seed=0)
+    frame = ContinuousCanvas(lod_threshold=lod_threshold).render(ocean)
+    portrayals = [portrayal for layer in frame.values() for portrayal in layer]
+    scenery = len(ocean.bloods) + len(ocean.obstacles) + len(ocean.sands)
+    return ocean, portrayals, scenery
+
+
+def test_canvas_draws_a_density_grid_above_the_threshold():
+    ocean, portrayals, scenery = render(40, lod_threshold=30)
+    densities = [p for p in portrayals if p["Shape"] == "density"]
+    assert len(densities) == 1
+    assert sum(densities[0]["counts"]) == 40
+    assert len(densities[0]["counts"]) == densities[0]["rows"] * densities[0]["cols"]
+    # One density grid, the sharks and the seagulls, and no fish.
+    assert len(portrayals) == scenery + 1 + 3 + 2
+
+
+def test_canvas_draws_every_fish_below_the_threshold():
+    ocean, portrayals, scenery = render(20, lod_threshold=30)
+    assert not any(p["Shape"] == "density" for p in portrayals)
+    assert len(portrayals) == scenery + 20 + 3 + 2
@@ -0,0 +1,85 @@
+import pytest
+
+from fishnsharks.model import Ocean
+from fishnsharks.staged import sense_fish, sense_seagulls, sense_sharks
+
+
+def quiet_ocean(*args, **kwargs):
+    return Ocean(*args, scheduler="staged", seed=0, **kwargs)
+
+
+def claim(ocean, sharks):
+    ocean.start_claims()
+    for shark in sharks:
+        shark.act(*shark.sense())
+    ocean.resolve_claims()
+
+
+@pytest.mark.parametrize("distances", [(4, 2), (3, 3)])
+def test_claimed_fish_goes_to_the_closest_shark(distances):
+    ocean = quiet_ocean(1, 2, 0, 20)
+    (fish,) = ocean.list_fish
+    sharks = ocean.list_sharks
+    fish.pos = (300.0, 300.0)
+    for shark, distance in zip(sharks, distances):
+        shark.pos = (300.0 - distance, 300.0)
+    ocean.update_data()
+
+    claim(ocean, sharks)
+
+    # The closest shark wins, the one with the lowest id on a tie.
+    winner, loser = sharks[::-1] if distances[1] < distances[0] else sharks
+    assert not ocean.is_alive(fish)
+    assert len(ocean.bloods) == 1
+    assert winner.remaining_rest_time == winner.rest_time
+    assert loser.remaining_rest_time == 0
+
+
+def run(ocean, steps):
+    for _ in range(steps):
+        ocean.step()
+    return ocean
+
+
+@pytest.mark.parametrize("occlusion", [False, True])
+def test_batch_sensing_matches_the_agents(occlusion):
+    ocean = run(quiet_ocean(300, 8, 3, 10, occlusion=occlusion), 20)
+    assert ocean.bloods
+    # Put a fish in sight of the first seagull.
+    x, y = ocean.list_seagulls[0].pos
+    ocean.list_fish[-1].pos = (x - 5, y - 5)
+    ocean.update_data()
+
+    fish_percepts = sense_fish(ocean)
+    assert any(fish_percepts)
+    assert fish_percepts == [fish.sense() for fish in ocean.list_fish]
+
+    for shark, percept in zip(ocean.list_sharks, sense_sharks(ocean)):
+        n_sands, nearest_fish, d_nearest_fish, blood_distances = shark.sense()
+        assert percept[0] == n_sands
+        assert percept[1] is nearest_fish
+        assert percept[2] == pytest.approx(d_nearest_fish)
+        assert percept[3] == pytest.approx(blood_distances)
+
+    seagull_percepts = sense_seagulls(ocean)
+    assert seagull_percepts[0]
+    for seagull, percept in zip(ocean.list_seagulls, seagull_percepts):
+        assert percept == seagull.sense()[:1]
+
+
+def snapshot(ocean):
+    return {agent.unique_id: agent.pos for agent in ocean.schedule.agents}, [
+        (blood.x, blood.y) for blood in ocean.bloods
+    ]
+
+
+def test_step_does_not_depend_on_the_order_of_the_agents():
+    expected = snapshot(run(quiet_ocean(300, 8, 3, 10), 10))
+
+    ocean = quiet_ocean(300, 8, 3, 10)
+    agents = ocean.schedule._agents
+    for unique_id in reversed(list(agents)):
+        agents.move_to_end(unique_id)
+    ocean.update_data()
+
+    assert snapshot(run(ocean, 10)) == expected
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+
+from fishnsharks.model import Ocean
+from fishnsharks.termination import NoSharks, Stagnation
+
+
+def run(ocean):
+    while ocean.running:
+        ocean.step()
+    return ocean
+
+
+def test_no_sharks_stops_a_run_without_sharks():
+    ocean = run(Ocean(20, 0, 2, 20, seed=0, max_steps=300, termination=[NoSharks()]))
+    assert ocean.stop_reason == "no_sharks"
+    assert ocean.schedule.steps < 300
+
+
+def test_no_sharks_waits_for_the_sharks():
+    ocean = Ocean(20, 3, 0, 20, seed=0, termination=[NoSharks()])
+    ocean.step()
+    assert ocean.running
+
+
+@pytest.mark.parametrize("occlusion", [False, True])
+def test_no_sharks_matches_the_seagulls_perception(occlusion):
+    ocean = Ocean(60, 0, 3, 10, seed=1, occlusion=occlusion, max_steps=150)
+    criterion = NoSharks()
+    results = []
+    while ocean.running:
+        ocean.step()
+        expected = all(
+            not seagull.fishing and not seagull.flying_away and not seagull.sense()
+            for seagull in ocean.list_seagulls
+        )
+        assert criterion(ocean) == expected
+        results.append(expected)
+    assert True in results and False in results
+
+
+def test_no_sharks_waits_for_a_fish_in_sight():
+    ocean = Ocean(1, 0, 1, 20, seed=0)
+    (fish,), (seagull,) = ocean.list_fish, ocean.list_seagulls
+    x, y = seagull.pos
+    fish.pos = (x + 5, abs(y - 5))
+    ocean.update_data()
+    assert not NoSharks()(ocean)
+
+    ocean.schedule.remove(fish)
+    ocean.update_data()
+    assert NoSharks()(ocean)
+
+
+def test_stagnation_counts_steps_since_last_change():
+    criterion = Stagnation(window=3)
+    model = SimpleNamespace(
+        list_fish=[1, 2], list_sharks=[], list_seagulls=[], schedule=SimpleNamespace()
+    )
+    met = []
+    for step in range(8):
+        model.schedule.steps = step
+        if step == 2:
+            model.list_fish = [1]
+        met.append(criterion(model))
+    assert met == [False, False, False, False, False, True, True, True]
+
+
+def test_default_runs_stop_at_max_steps():
+    ocean = run(Ocean(10, 1, 1, 20, seed=0, max_steps=5))
+    assert ocean.stop_reason == "max_steps"
+    assert ocean.schedule.steps == 5
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from fishnsharks.trace import (
+    Trace,
+    compare_statistically,
+    differential_check,
+    first_divergence,
+    record_trace,
+    reference_engine,
+)
+
+PARAMS = dict(n_fish=30, n_sharks=5, n_seagulls=2, fish_space=20)
+
+
+@pytest.fixture(scope="module")
+def trace():
+    return record_trace(seed=2, steps=80, **PARAMS)
+
+
+def copy(trace):
+    return Trace(
+        trace.populations.copy(),
+        [ids.copy() for ids in trace.ids],
+        [positions.copy() for positions in trace.positions],
+        {name: values.copy() for name, values in trace.events.items()},
+    )
+
+
+def assert_same(a, b):
+    np.testing.assert_array_equal(a.populations, b.populations)
+    assert len(a.ids) == len(b.ids) and len(a.positions) == len(b.positions)
+    for x, y in zip(a.ids + a.positions, b.ids + b.positions):
+        np.testing.assert_array_equal(x, y)
+    assert a.events.keys() == b.events.keys()
+    for name in a.events:
+        np.testing.assert_array_equal(a.events[name], b.events[name])
+
+
+@pytest.mark.parametrize("record_positions", [True, False])
+def test_save_load_round_trip(tmp_path, record_positions):
+    trace = record_trace(seed=2, steps=30, record_positions=record_positions, **PARAMS)
+    trace.save(tmp_path / "trace.npz")
+    assert_same(Trace.load(tmp_path / "trace.npz"), trace)
+
+
+def test_reference_matches_itself(trace):
+    assert len(trace.events["step"])
+    assert first_divergence(trace, record_trace(seed=2, steps=80, **PARAMS)) is None
+    assert differential_check(reference_engine, seed=3, steps=30, **PARAMS) is None
+
+
+def test_finds_a_planted_position_difference(trace):
+    candidate = copy(trace)
+    candidate.positions[40][3] += 0.01
+    divergence = first_divergence(trace, candidate)
+    assert divergence["step"] == 40
+    assert divergence["field"] == "positions"
+    assert first_divergence(trace, candidate, atol=0.1) is None
+
+
+def test_finds_a_planted_event_difference(trace):
+    candidate = copy(trace)
+    candidate.events["prey"][0] += 1
+    divergence = first_divergence(trace, candidate)
+    assert divergence["step"] == trace.events["step"][0]
+    assert divergence["field"] == "events"
+
+
+def test_finds_a_planted_population_difference(trace):
+    candidate = copy(trace)
+    candidate.populations[10:, 0] -= 1
+    candidate.ids[10] = candidate.ids[10][1:]
+    divergence = first_divergence(trace, candidate)
+    assert divergence["step"] == 10
+    assert divergence["field"] == "populations"
+
+
+def test_finds_a_shorter_trace(trace):
+    candidate = copy(trace)
+    candidate.populations = candidate.populations[:50]
+    assert first_divergence(trace, candidate)["field"] == "length"
+
+
+def test_reference_is_statistically_consistent_with_itself():
+    report = compare_statistically(reference_engine, range(5), 20, **PARAMS)
+    assert all(result["consistent"] for result in report.values())
+    assert all(result["mean_gap"] == 0 for result in report.values())
@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from fishnsharks.model import Ocean
+from fishnsharks.utils import (
+    direction_to,
+    direction_to_batch,
+    distanceL2,
+    distanceL2_batch,
+    go_to,
+    go_to_batch,
+    is_on_obstacle,
+    is_on_obstacle_batch,
+    is_outside,
+    is_outside_batch,
+    move,
+    move_batch,
+)
+
+N = 20000
+
+
+@pytest.fixture(scope="module")
+def ocean():
+    return Ocean(0, 0, 0, 20, seed=0)
+
+
+@pytest.fixture(scope="module")
+def inputs():
+    rng = np.random.default_rng(0)
+    return {
+        "points": rng.uniform(-50, 650, (N, 2)),
+        "targets": rng.uniform(-50, 650, (N, 2)),
+        "speed": rng.uniform(0, 30, N),
+        "angle": rng.uniform(0, 2 * np.pi, N),
+    }
+
+
+def test_predicates_match_the_scalar_functions(ocean, inputs):
+    points = inputs["points"]
+    for d_safe in (0, 1):
+        expected = [is_on_obstacle(p, ocean, d_safe) for p in points.tolist()]
+        np.testing.assert_array_equal(
+            is_on_obstacle_batch(points, ocean, d_safe), expected
+        )
+    expected = [is_outside(p, ocean) for p in points.tolist()]
+    np.testing.assert_array_equal(is_outside_batch(points, ocean), expected)
+
+
+def test_geometry_matches_the_scalar_functions(inputs):
+    points, targets = inputs["points"], inputs["targets"]
+    pairs = list(zip(targets.tolist(), points.tolist()))
+    np.testing.assert_allclose(
+        distanceL2_batch(points, targets),
+        [distanceL2(p, t) for t, p in pairs],
+        rtol=0,
+        atol=1e-12,
+    )
+    np.testing.assert_allclose(
+        direction_to_batch(targets, points),
+        [direction_to(t, p) for t, p in pairs],
+        rtol=0,
+        atol=1e-12,
+    )
+
+
+def test_move_matches_the_scalar_function(ocean, inputs):
+    points, speed, angle = inputs["points"], inputs["speed"], inputs["angle"]
+    # The scalar function starts from positions inside the ocean.
+    points = np.clip(points, 0, 600)
+    expected = [
+        move(x, y, s, a, ocean)
+        for (x, y), s, a in zip(points.tolist(), speed.tolist(), angle.tolist())
+    ]
+    np.testing.assert_allclose(
+        move_batch(points, speed, angle, ocean), expected, rtol=0, atol=1e-12
+    )
+
+
+def test_go_to_matches_the_scalar_function(ocean, inputs):
+    points, targets = np.clip(inputs["points"], 0, 600), inputs["targets"]
+    speed = inputs["speed"]
+    # Agents reaching their target draw a random direction, they are left out.
+    moving = np.sqrt(((targets - points) ** 2).sum(axis=1)) >= speed
+    points, targets, speed = points[moving], targets[moving], speed[moving]
+    expected = [
+        go_to(t, p, s, ocean)
+        for t, p, s in zip(targets.tolist(), points.tolist(), speed.tolist())
+    ]
+    new_points, angle = go_to_batch(targets, points, speed, ocean)
+    np.testing.assert_allclose(
+        new_points, [pos for pos, _ in expected], rtol=0, atol=1e-12
+    )
+    np.testing.assert_allclose(angle, [a for _, a in expected], rtol=0, atol=1e-12)
+
+
+def test_float32_inputs_stay_float32(ocean, inputs):
+    points = inputs["points"][:100].astype(np.float32)
+    targets = inputs["targets"][:100].astype(np.float32)
+    speed, angle = inputs["speed"][:100], inputs["angle"][:100]
+    assert move_batch(points, speed, angle, ocean).dtype == np.float32
+    assert go_to_batch(targets, points, speed, ocean)[0].dtype == np.float32
+    assert distanceL2_batch(points, targets).dtype == np.float32
+    assert direction_to_batch(targets, points).dtype == np.float32
+
+
+def test_empty_inputs(ocean):
+    empty = np.zeros((0, 2))
+    assert move_batch(empty, 1.0, 0.0, ocean).shape == (0, 2)
+    new_points, angle = go_to_batch(empty, empty, 1.0, ocean)
+    assert new_points.shape == (0, 2) and angle.shape == (0,)
+    assert direction_to_batch(empty, empty).shape == (0,)
+    assert distanceL2_batch(empty, empty).shape == (0,)
+    assert is_on_obstacle_batch(empty, ocean).shape == (0,)
+    assert is_outside_batch(empty, ocean).shape == (0,)
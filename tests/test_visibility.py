@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from fishnsharks.env import Land
+from fishnsharks.visibility import VisibilityMap, segments_cross_circle
+
+OBSTACLES = [Land(0, 0, 120), Land(300, 300, 60)]
+
+
+def test_packed_table_matches_segment_test():
+    vmap = VisibilityMap(600, 600, OBSTACLES, cell_size=40)
+    rng = np.random.default_rng(0)
+    points1 = rng.uniform(0, 600, (50, 2))
+    points2 = rng.uniform(0, 600, (70, 2))
+
+    # Expected visibility between the centers of the cells of the points.
+    centers1 = (np.floor(points1 / 40) + 0.5) * 40
+    centers2 = (np.floor(points2 / 40) + 0.5) * 40
+    expected = np.ones((50, 70), dtype=bool)
+    for obstacle in OBSTACLES:
+        expected &= ~segments_cross_circle(
+            centers1[:, None], centers2[None], (obstacle.x, obstacle.y), obstacle.r - 20
+        )
+
+    visible = vmap.visible_batch(points1, points2)
+    np.testing.assert_array_equal(visible, expected)
+    assert expected.any() and not expected.all()
+    for i, j in [(0, 0), (3, 7), (49, 69)]:
+        assert vmap.visible(points1[i], points2[j]) == expected[i, j]
+
+
+def test_table_uses_one_bit_per_pair():
+    vmap = VisibilityMap(600, 600, OBSTACLES, cell_size=20)
+    assert vmap.nbytes == 900 * ((900 + 7) // 8)
+
+
+def test_rejects_too_fine_cells():
+    with pytest.raises(ValueError):
+        VisibilityMap(6000, 6000, OBSTACLES, cell_size=5)